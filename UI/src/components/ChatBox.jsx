@@ -1,8 +1,10 @@
 import React, { useState, useRef, useEffect } from 'react';
-import { executeCommand } from '../services/api';
+import { executeCommandStream } from '../services/api';
 import { ToastContainer, toast } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
 
+const newSessionId = () => (window.crypto?.randomUUID ? window.crypto.randomUUID() : `${Date.now()}-${Math.random()}`);
+
 function ChatBox() {
   const [input, setInput] = useState('');
 
@@ -26,7 +28,16 @@ function ChatBox() {
       { sender: 'bot', text: 'Hello! I am your AI Cloud Operations Agent. How can I help you manage your AWS resources today?' }
     ];
   });
+  // Conversation memory on the backend is keyed by this id
+  const [sessionId, setSessionId] = useState(() => {
+    const saved = localStorage.getItem('cloud_agent_session_id');
+    if (saved) return saved;
+    const id = newSessionId();
+    localStorage.setItem('cloud_agent_session_id', id);
+    return id;
+  });
   const [isLoading, setIsLoading] = useState(false);
+  const [progress, setProgress] = useState('');
   const messagesEndRef = useRef(null);
 
   // Scroll to bottom when new message added
@@ -49,19 +60,22 @@ function ChatBox() {
     setIsLoading(true);
 
     try {
-      const result = await executeCommand(query, selectedAccount);
-
-      // Attempt to prettify JSON responses
-      let displayResult = result;
-      if (result && typeof result.response === 'string') {
-        displayResult = result.response;
-      } else if (typeof result === 'object' && result !== null) {
-        displayResult = JSON.stringify(result, null, 2);
-      }
+      // Show tool progress until the final answer starts streaming in
+      let answer = '';
+      const result = await executeCommandStream(query, selectedAccount, (event) => {
+        if (event.type === 'token') {
+          answer += event.text;
+          setProgress(answer);
+        } else if (!answer && event.type === 'tool_start') {
+          setProgress(`Running ${event.tool}...`);
+        } else if (!answer && event.type === 'tool_end') {
+          setProgress(`${event.tool} finished in ${event.seconds}s`);
+        }
+      }, sessionId);
 
       setMessages((prev) => [
         ...prev,
-        { sender: 'bot', text: displayResult }
+        { sender: 'bot', text: result.text }
       ]);
     } catch (err) {
       toast.error('Error executing command or unable to reach backend.');
@@ -71,6 +85,7 @@ function ChatBox() {
       ]);
     } finally {
       setIsLoading(false);
+      setProgress('');
     }
   };
 
@@ -79,6 +94,9 @@ function ChatBox() {
       const initial = [{ sender: 'bot', text: 'Chat history cleared. How can I help you?' }];
       setMessages(initial);
       localStorage.setItem('cloud_agent_messages', JSON.stringify(initial));
+      const id = newSessionId();
+      setSessionId(id);
+      localStorage.setItem('cloud_agent_session_id', id);
     }
   };
 
@@ -204,7 +222,7 @@ function ChatBox() {
               gap: '6px',
               alignItems: 'center'
             }}>
-              <span className="dot-pulse">Processing...</span>
+              <span className="dot-pulse" style={{ whiteSpace: 'pre-wrap' }}>{progress || 'Processing...'}</span>
             </div>
           </div>
         )}
@@ -27,3 +27,53 @@ export const executeCommand = async (command, accountId = null) => {
   }
 };
 
+
+// Streams agent progress from /api/execute/stream (NDJSON, one event per line).
+// onEvent is called for every event; resolves with the final event.
+export const executeCommandStream = async (command, accountId = null, onEvent = () => {}, sessionId = null) => {
+  let res;
+  try {
+    res = await fetch(`${API_BASE}/api/execute/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ command, account_id: accountId, session_id: sessionId }),
+    });
+  } catch (error) {
+    throw new Error('No response from backend. Is the server running on http://localhost:8080?');
+  }
+
+  if (!res.ok) {
+    const data = await res.json().catch(() => ({}));
+    throw new Error(`Backend Error (${res.status}): ${data.detail || 'Unknown error'}`);
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let final = null;
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      const event = JSON.parse(line);
+      if (event.type === 'error') {
+        throw new Error(`Backend Error (${event.status}): ${event.detail}`);
+      }
+      if (event.type === 'final') final = event;
+      onEvent(event);
+    }
+  }
+
+  if (!final) {
+    throw new Error('Stream ended before the agent finished.');
+  }
+  return final;
+};
@@ -1,9 +1,13 @@
-from app.rag import rag_search
-from app.llm import ask_llm
+from app.rag import rag_context
+from app.llm import LLMError, ask_llm
 import json
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 ALLOWED_COMMANDS = ["list-s3", "describe-ec2","codepipeline-status"]
+_COMMAND_RE = re.compile(r"(list-s3|describe-ec2|codepipeline-status)")
 
 def interpret_command(user_query: str) -> str:
     q = user_query.lower()
@@ -20,7 +24,7 @@ def interpret_command(user_query: str) -> str:
 
 
     # ---------- LAYER 2: LLM + RAG ----------
-    docs = rag_search(user_query)
+    docs = rag_context(user_query)
 
     prompt = f"""
 You are an AWS automation agent.
@@ -39,14 +43,25 @@ Return ONLY JSON in this format:
 No explanation.
 """
 
-    raw = ask_llm(prompt)
+    # JSON-constrained, short, and cut off as soon as a command name shows up
+    try:
+        raw = ask_llm(
+            prompt,
+            format="json",
+            options={"temperature": 0, "num_predict": 32},
+            stop_when=lambda text: _COMMAND_RE.search(text.lower()),
+        )
+    except LLMError as e:
+        logger.warning(f"LLM unavailable for command interpretation: {e}")
+        return "unknown"
 
     # ---------- HARD PARSE ----------
     try:
         data = json.loads(raw)
         cmd = data.get("command", "")
     except Exception:
-        match = re.search(r"(list-s3|describe-ec2)", raw.lower())
+        # Stopped early, so usually a partial object like {"command": "list-s3
+        match = _COMMAND_RE.search(raw.lower())
         cmd = match.group(1) if match else "unknown"
 
     return cmd if cmd in ALLOWED_COMMANDS else "unknown"
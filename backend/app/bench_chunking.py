@@ -0,0 +1,108 @@
+"""
+Micro-benchmark: whole-page parse + fixed-window chunking vs the streaming
+chunker, on a synthetic doc page.
+
+Each pipeline runs in its own fresh process so peak RSS is not shared.
+
+Usage:
+    python -m app.bench_chunking                 # ~20 MB page
+    python -m app.bench_chunking --sections 5000
+"""
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append("/app")
+
+SECTION = """
+<section><h2>Section {i}</h2>
+<p>The DescribeInstances API returns information about the instances in your account. You can filter
+results by instance state, type or tag. Pagination is supported through NextToken. Example {i}.</p>
+<ul><li>InstanceId: i-{i:012x}</li><li>State: running</li><li>Type: t3.medium</li></ul>
+<pre>aws ec2 describe-instances --filters Name=instance-state-name,Values=running --max-items {i}</pre>
+<table><tr><th>Field</th><th>Type</th></tr><tr><td>Reservations</td><td>Array of Reservation</td></tr></table>
+</section>
+"""
+CHROME = """
+<nav class="navbar"><a href="/">Home</a><a href="/ec2">EC2</a><a href="/s3">S3</a></nav>
+<div id="sidebar"><ul><li>Getting started</li><li>API reference</li></ul></div>
+<script>window.analytics = {{page: "{i}"}};</script>
+"""
+
+
+def write_page(path, sections):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<html><head><title>EC2 API</title></head><body><main>")
+        for i in range(sections):
+            f.write(SECTION.format(i=i))
+            if i % 50 == 0:
+                f.write(CHROME.format(i=i))
+        f.write("</main><footer>Copyright</footer></body></html>")
+
+
+def _baseline(path):
+    from app.chunk import chunk_text
+    from app.ingest_aws_docs import html_to_text
+
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    return sum(1 for _ in chunk_text(html_to_text(html)))
+
+
+def _streaming(path):
+    from app.stream_chunker import iter_file_pieces, stream_chunks
+
+    return sum(1 for _ in stream_chunks(iter_file_pieces(path)))
+
+
+PIPELINES = {"baseline": _baseline, "streaming": _streaming}
+
+
+def _run(name, path, results):
+    tracemalloc.start()
+    started = time.perf_counter()
+    chunks = PIPELINES[name](path)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results.put({
+        "pipeline": name,
+        "chunks": chunks,
+        "seconds": elapsed,
+        "py_peak_mb": peak / 1e6,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML chunking pipelines.")
+    parser.add_argument("--sections", type=int, default=20000)
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "page.html")
+        write_page(path, args.sections)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"Synthetic page: {size_mb:.1f} MB, {args.sections} sections\n")
+        print(f"{'pipeline':<10} {'chunks':>8} {'seconds':>8} {'MB/s':>8} {'py peak MB':>11} {'max RSS MB':>11}")
+
+        for name in PIPELINES:
+            results = ctx.Queue()
+            proc = ctx.Process(target=_run, args=(name, path, results))
+            proc.start()
+            r = results.get()
+            proc.join()
+            print(
+                f"{r['pipeline']:<10} {r['chunks']:>8} {r['seconds']:>8.2f} {size_mb / r['seconds']:>8.1f} "
+                f"{r['py_peak_mb']:>11.1f} {r['max_rss_mb']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
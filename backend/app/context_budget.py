@@ -0,0 +1,99 @@
+"""
+Post-processing for retrieved chunks before they go into a prompt.
+
+Both chunkers overlap neighbouring chunks, so top-k results often repeat
+text. Here, chunks from the same source that overlap or touch are merged,
+near-duplicates are dropped, and the result is packed into a token budget
+in relevance order.
+
+Apart from this paragraph, a verbatim copy of
+backend_langchain/backend_langchain/app/context_budget.py, which is canonical. The two backends build separate images from their own
+app/ directories, so the module can't be shared: make changes there and
+copy the file here, never edit this copy alone.
+"""
+import re
+
+MIN_OVERLAP = 20        # chars of shared text needed to treat two chunks as overlapping
+MAX_OVERLAP = 400       # longest overlap worth searching for (chunkers use 100-200)
+DUPLICATE_CONTAINMENT = 0.8  # share of a chunk's word 3-grams already present elsewhere
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _overlap(a: str, b: str) -> int:
+    """Length of the longest suffix of a that is also a prefix of b."""
+    for n in range(min(len(a), len(b), MAX_OVERLAP), MIN_OVERLAP - 1, -1):
+        if a.endswith(b[:n]):
+            return n
+    return 0
+
+
+def _shingles(text: str) -> set:
+    words = re.findall(r"\w+", text.lower())
+    return {tuple(words[i:i + 3]) for i in range(max(1, len(words) - 2))}
+
+
+def _join(a: dict, b: dict):
+    """Merged text if b continues a (textual overlap or adjacent offsets), else None."""
+    n = _overlap(a["text"], b["text"])
+    if n:
+        return a["text"] + b["text"][n:]
+    if a["end"] is not None and b["start"] is not None and 0 <= b["start"] - a["end"] <= 1:
+        return a["text"] + " " + b["text"]
+    return None
+
+
+def _merge_into(blocks: list, chunk: dict) -> bool:
+    for block in blocks:
+        if block["source"] != chunk["source"] or block["source"] is None:
+            continue
+        if chunk["text"] in block["text"]:
+            return True
+        for first, second in ((block, chunk), (chunk, block)):
+            merged = _join(first, second)
+            if merged is not None:
+                block["text"] = merged
+                block["start"] = first["start"]
+                block["end"] = second["end"]
+                block["rank"] = min(block["rank"], chunk["rank"])
+                return True
+    return False
+
+
+def build_context(chunks, token_budget: int, separator: str = "\n\n---\n\n") -> str:
+    """
+    chunks: [(text, metadata), ...] in relevance order. Metadata may carry
+    'source' and a start offset ('start_index' or 'start').
+    """
+    blocks = []
+    for rank, (text, metadata) in enumerate(chunks):
+        metadata = metadata or {}
+        start = metadata.get("start_index", metadata.get("start"))
+        chunk = {
+            "text": text.strip(),
+            "source": metadata.get("source"),
+            "start": start,
+            "end": start + len(text) if start is not None else None,
+            "rank": rank,
+        }
+        if not chunk["text"] or _merge_into(blocks, chunk):
+            continue
+
+        shingles = _shingles(chunk["text"])
+        if any(len(shingles & _shingles(b["text"])) / len(shingles) >= DUPLICATE_CONTAINMENT for b in blocks):
+            continue
+        blocks.append(chunk)
+
+    selected, used = [], 0
+    for block in sorted(blocks, key=lambda b: b["rank"]):
+        cost = estimate_tokens(block["text"])
+        if used + cost <= token_budget:
+            selected.append(block["text"])
+            used += cost
+        elif not selected:
+            # Always return something: clip the most relevant block to the budget
+            selected.append(block["text"][: token_budget * 4])
+            break
+    return separator.join(selected)
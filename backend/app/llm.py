@@ -1,12 +1,105 @@
-import requests
+import json
+import logging
 import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+LLM_URL = os.getenv("LLM_URL", "http://llm:11434/api/generate")
+LLM_MODEL = os.getenv("LLM_MODEL", "mistral")
+LLM_KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "30m")  # keep the model loaded between requests
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "120"))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "8"))
+
+
+class LLMError(Exception):
+    pass
+
+
+def iter_ndjson(chunks):
+    """Decode NDJSON incrementally from an iterable of byte chunks, one object per line."""
+    buf = b""
+    for chunk in chunks:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if buf.strip():
+        yield json.loads(buf)
+
+
+class OllamaClient:
+    """One pooled keep-alive session to Ollama's /api/generate, shared by every caller."""
+
+    def __init__(self, url: str, model: str, keep_alive: str, timeout: tuple, pool_size: int):
+        self.url = url
+        self.model = model
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def generate(self, prompt: str, format: str | None = None, options: dict | None = None, stop_when=None) -> str:
+        """
+        Return the model's full response text. With `stop_when`, the response
+        is streamed and generation is abandoned as soon as stop_when(text_so_far)
+        is truthy — closing the connection makes Ollama stop generating.
+        """
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stop_when is not None,
+            "keep_alive": self.keep_alive,
+        }
+        if format:
+            payload["format"] = format
+        if options:
+            payload["options"] = options
+
+        try:
+            if stop_when is None:
+                resp = self.session.post(self.url, json=payload, timeout=self.timeout)
+                resp.raise_for_status()
+                data = resp.json()
+                if "error" in data:
+                    raise LLMError(data["error"])
+                return data.get("response", "").strip()
+
+            text = ""
+            with self.session.post(self.url, json=payload, timeout=self.timeout, stream=True) as resp:
+                resp.raise_for_status()
+                for data in iter_ndjson(resp.iter_content(chunk_size=None)):
+                    if "error" in data:
+                        raise LLMError(data["error"])
+                    text += data.get("response", "")
+                    if data.get("done") or stop_when(text):
+                        break
+            return text.strip()
+        except (requests.RequestException, ValueError) as e:
+            raise LLMError(f"Ollama request failed: {e}") from e
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> OllamaClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OllamaClient(
+                    LLM_URL, LLM_MODEL, LLM_KEEP_ALIVE, (LLM_CONNECT_TIMEOUT, LLM_READ_TIMEOUT), LLM_POOL_SIZE
+                )
+    return _client
 
-LLM_URL = os.getenv("LLM_URL")
 
-def ask_llm(prompt: str):
-    payload = {
-        "model": "mistral",
-        "prompt": prompt
-    }
-    response = requests.post(LLM_URL, json=payload, stream=False)
-    return response.text.strip()
+def ask_llm(prompt: str, **kwargs) -> str:
+    return get_client().generate(prompt, **kwargs)
@@ -1,4 +1,9 @@
+import os
 import chromadb
+from app.context_budget import build_context
+
+RAG_CANDIDATES = int(os.getenv("RAG_CANDIDATES", "8"))
+RAG_CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_TOKENS", "600"))
 
 # Create ONE client (Chroma v2 – correct way)
 client = chromadb.HttpClient(
@@ -17,3 +22,13 @@ def rag_search(query: str, n_results: int = 5):
 
     # Chroma returns: {"documents": [[doc1, doc2, ...]]}
     return results["documents"][0]
+
+
+def rag_context(query: str, n_results: int = RAG_CANDIDATES, token_budget: int = RAG_CONTEXT_TOKENS) -> str:
+    """Retrieved docs merged, de-duplicated and trimmed to a token budget for prompting."""
+    results = collection.query(
+        query_texts=[query],
+        n_results=n_results,
+        include=["documents", "metadatas"],
+    )
+    return build_context(zip(results["documents"][0], results["metadatas"][0]), token_budget)
@@ -1,11 +1,46 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import boto3
 
 cp = boto3.client("codepipeline")
 
+# Definitions rarely change; state is what gets polled during deploys
+DEFINITION_TTL = int(os.getenv("PIPELINE_DEFINITION_TTL_SECONDS", "600"))
+STATE_TTL = int(os.getenv("PIPELINE_STATE_TTL_SECONDS", "15"))
+
+_cache = {}
+_cache_lock = threading.Lock()
+_pool = ThreadPoolExecutor(max_workers=4)
+
+
+def _cached(kind, pipeline_name, ttl, fetch):
+    key = (kind, pipeline_name)
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit and hit[1] > now:
+            return hit[0]
+
+    value = fetch(name=pipeline_name)
+    with _cache_lock:
+        _cache[key] = (value, now + ttl)
+    return value
 
-def get_pipeline_overall_status(pipeline_name):
-    state = cp.get_pipeline_state(name=pipeline_name)
 
+def get_pipeline_snapshot(pipeline_name):
+    """
+    Fetch pipeline state and definition concurrently (one call each,
+    cached separately) and return them together.
+    """
+    state_future = _pool.submit(_cached, "state", pipeline_name, STATE_TTL, cp.get_pipeline_state)
+    pipeline = _cached("definition", pipeline_name, DEFINITION_TTL, cp.get_pipeline)
+    return {"state": state_future.result(), "pipeline": pipeline}
+
+
+def _overall_status(state):
     executions = []
     for stage in state["stageStates"]:
         exec = stage.get("latestExecution")
@@ -30,9 +65,7 @@ def get_pipeline_overall_status(pipeline_name):
     }
 
 
-def get_pipeline_commit_id(pipeline_name):
-    state = cp.get_pipeline_state(name=pipeline_name)
-
+def _commit_id(state):
     for stage in state["stageStates"]:
         if stage["stageName"].lower() == "source":
             for action in stage.get("actionStates", []):
@@ -42,9 +75,7 @@ def get_pipeline_commit_id(pipeline_name):
     return None
 
 
-def get_pipeline_source(pipeline_name):
-    pipeline = cp.get_pipeline(name=pipeline_name)
-
+def _source(pipeline):
     for stage in pipeline["pipeline"]["stages"]:
         if stage["name"].lower() == "source":
             action = stage["actions"][0]
@@ -58,14 +89,24 @@ def get_pipeline_source(pipeline_name):
     return {}
 
 
+def get_pipeline_overall_status(pipeline_name):
+    return _overall_status(_cached("state", pipeline_name, STATE_TTL, cp.get_pipeline_state))
+
+
+def get_pipeline_commit_id(pipeline_name):
+    return _commit_id(_cached("state", pipeline_name, STATE_TTL, cp.get_pipeline_state))
+
+
+def get_pipeline_source(pipeline_name):
+    return _source(_cached("definition", pipeline_name, DEFINITION_TTL, cp.get_pipeline))
+
+
 def get_pipeline_info(pipeline_name):
-    status = get_pipeline_overall_status(pipeline_name)
-    commit_id = get_pipeline_commit_id(pipeline_name)
-    source = get_pipeline_source(pipeline_name)
+    snapshot = get_pipeline_snapshot(pipeline_name)
 
     return {
         "pipeline": pipeline_name,
-        **status,
-        "commitId": commit_id,
-        "source": source
+        **_overall_status(snapshot["state"]),
+        "commitId": _commit_id(snapshot["state"]),
+        "source": _source(snapshot["pipeline"])
     }
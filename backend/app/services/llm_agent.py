@@ -1,4 +1,9 @@
-import requests
+import re
+
+from app.llm import ask_llm
+
+_COMMAND_RE = re.compile(r"(list-s3|describe-ec2)")
+
 
 def map_to_command(user_input: str):
     prompt = f"""
@@ -13,16 +18,11 @@ def map_to_command(user_input: str):
     User: "{user_input}"
     """
 
-    response = requests.post(
-        "http://localhost:11434/api/generate",
-        json={"model": "mistral", "prompt": prompt}
-    )
-    
-    text = ""
-    for line in response.iter_lines():
-        if line:
-            data = line.decode("utf-8")
-            if '"response"' in data:
-                text += data.split('"response":"')[1].split('"')[0]
-
-    return text.strip().lower()
+    # Streamed through the shared client; stops as soon as a command name appears
+    text = ask_llm(
+        prompt,
+        options={"temperature": 0, "num_predict": 16},
+        stop_when=lambda t: _COMMAND_RE.search(t.lower()),
+    ).lower()
+    match = _COMMAND_RE.search(text)
+    return match.group(1) if match else text
@@ -0,0 +1,167 @@
+"""
+Streaming HTML -> text chunk pipeline.
+
+HTML is fed to an incremental parser piece by piece, navigation and other
+boilerplate elements are skipped, and text comes out as blocks at
+block-element boundaries. Blocks are packed into sentence- and
+heading-aware chunks that are yielded lazily. At any point only one
+network read, one text block and one chunk are held in memory, however
+large the page is.
+"""
+import re
+from collections import deque
+from html.parser import HTMLParser
+
+# Elements whose whole subtree is boilerplate. <header> is only skipped as
+# the page-level banner (a direct child of <body>); inside an article it
+# usually holds the page's <h1>.
+SKIP_TAGS = {"head", "script", "style", "noscript", "template", "svg", "nav", "footer", "aside", "form", "button"}
+# Whole class/id/role tokens that mark boilerplate containers on doc sites.
+# Matched token by token, so "page-header" or "main-content-toc" don't count.
+BOILERPLATE_TOKENS = {
+    "nav", "navbar", "navigation", "breadcrumb", "breadcrumbs", "sidebar",
+    "toc", "footer", "banner", "cookie", "feedback",
+}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+BLOCK_TAGS = HEADING_TAGS | {
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "dl", "dt", "dd",
+    "table", "tr", "td", "th", "pre", "blockquote", "br", "hr",
+}
+MAX_BLOCK_CHARS = 4096  # split runaway text (e.g. one giant <pre>) so a block stays bounded
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _is_boilerplate(attrs):
+    tokens = {t.lower() for k, v in attrs if k in ("class", "id", "role") and v for t in v.split()}
+    return not tokens.isdisjoint(BOILERPLATE_TOKENS)
+
+
+class _BlockParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = deque()
+        self._buf = []
+        self._buf_len = 0
+        self._skip_tag = None
+        self._skip_depth = 0
+        self._open = []  # enclosing non-void tags, to tell a page <header> from an article one
+
+    def _flush(self, kind="text"):
+        text = _SPACE_RE.sub(" ", "".join(self._buf)).strip()
+        self._buf, self._buf_len = [], 0
+        if text:
+            self.blocks.append((kind, text))
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag not in VOID_TAGS:
+            if tag in SKIP_TAGS or _is_boilerplate(attrs) or (tag == "header" and self._open[-1:] == ["body"]):
+                self._skip_tag, self._skip_depth = tag, 1
+                return
+            self._open.append(tag)
+        if tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+        if tag in self._open:
+            # Also closes anything left unclosed inside it (<p>, <li> ...)
+            del self._open[len(self._open) - 1 - self._open[::-1].index(tag):]
+        if tag in HEADING_TAGS:
+            self._flush("heading")
+        elif tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._skip_tag:
+            return
+        self._buf.append(data)
+        self._buf_len += len(data)
+        if self._buf_len > MAX_BLOCK_CHARS:
+            self._flush()
+
+
+def iter_blocks(pieces):
+    """Yield (kind, text) blocks, kind being 'heading' or 'text', from an iterable of HTML pieces."""
+    parser = _BlockParser()
+    for piece in pieces:
+        parser.feed(piece)
+        while parser.blocks:
+            yield parser.blocks.popleft()
+    parser.close()
+    parser._flush()
+    while parser.blocks:
+        yield parser.blocks.popleft()
+
+
+def _sentences(text, size):
+    for sentence in _SENTENCE_RE.split(text):
+        # A "sentence" longer than a chunk (tables, code) is hard-split
+        for i in range(0, len(sentence), size):
+            yield sentence[i:i + size]
+
+
+def iter_chunks(blocks, size=1000, overlap=200):
+    """
+    Pack blocks into chunks of at most `size` chars, breaking between
+    sentences. Consecutive chunks within a section share up to `overlap`
+    chars of trailing sentences, less when the next sentence needs the room. A heading starts a new chunk and leads it.
+    """
+    current, length = [], 0
+    for kind, text in blocks:
+        if kind == "heading":
+            if current:
+                yield " ".join(current)
+            current, length = [text], len(text)
+            continue
+
+        for sentence in _sentences(text, size):
+            if current and length + 1 + len(sentence) > size:
+                yield " ".join(current)
+                # The carried overlap plus this sentence must still fit in `size`
+                budget = min(overlap, size - len(sentence))
+                carry, carried = [], 0
+                for s in reversed(current):
+                    if carried + len(s) + 1 > budget:
+                        break
+                    carry.insert(0, s)
+                    carried += len(s) + 1
+                current, length = carry, max(carried - 1, 0)
+            current.append(sentence)
+            length += len(sentence) + (1 if length else 0)
+
+    if current:
+        yield " ".join(current)
+
+
+def iter_url_pieces(url, session, chunk_bytes=64 * 1024):
+    """Stream a page's decoded HTML in pieces."""
+    with session.get(url, timeout=15, stream=True) as response:
+        response.raise_for_status()
+        response.encoding = response.encoding or "utf-8"
+        yield from response.iter_content(chunk_size=chunk_bytes, decode_unicode=True)
+
+
+def iter_file_pieces(path, chunk_chars=64 * 1024):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        while True:
+            piece = f.read(chunk_chars)
+            if not piece:
+                return
+            yield piece
+
+
+def stream_chunks(pieces, size=1000, overlap=200):
+    """HTML pieces in, text chunks out — lazily, end to end."""
+    return iter_chunks(iter_blocks(pieces), size=size, overlap=overlap)
@@ -0,0 +1,72 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from app.config import AGENT_QUEUE_SIZE, MAX_CONCURRENT_AGENT_RUNS
+
+
+class QueueFull(Exception):
+    """No run slot is free and the wait queue is already at capacity."""
+
+    def __init__(self, waiting: int):
+        super().__init__(f"Agent queue is full ({waiting} requests waiting)")
+        self.waiting = waiting
+
+
+class AdmissionController:
+    """
+    Caps concurrent agent runs. Up to `max_queue` requests may wait for a
+    slot; beyond that callers are rejected immediately instead of piling up.
+    Only touched from the event loop, so plain counters are safe.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    async def acquire(self):
+        """Take a run slot, waiting in the queue if needed. Pair with release()."""
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise QueueFull(self.waiting)
+            self.waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.active += 1
+        self.admitted += 1
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a run slot for the duration of the block."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+agent_admission = AdmissionController(MAX_CONCURRENT_AGENT_RUNS, AGENT_QUEUE_SIZE)
@@ -1,8 +1,11 @@
+import functools
+
 from langchain.agents import AgentExecutor, create_react_agent
 from langchain.prompts import PromptTemplate
-from langchain.memory import ConversationBufferWindowMemory
 
-from app.llm import llm
+from app.config import AGENT_MODE, TOOL_SELECTION_TOP_K
+from app.lifecycle import LazyComponent
+from app.llm import get_llm
 from app.rag import rag_search
 from app.services.aws_tools import (
     list_s3_buckets,
@@ -11,8 +14,10 @@ from app.services.aws_tools import (
     list_eks_clusters,
     describe_eks_cluster,
 )
-from app.services.codepipeline_tools import get_pipeline_status, list_pipelines
+from app.services.codepipeline_tools import get_pipeline_status, list_pipelines, get_all_pipeline_statuses
 from app.services.ssm_tools import get_ssm_parameter, list_ssm_parameters, put_ssm_parameter
+from app.json_agent import JsonAgent
+from app.tool_selection import EscalationWatcher, ToolSelector
 
 # ─────────────────────────────────────────────
 # All tools the agent can use
@@ -37,6 +42,7 @@ tools = [
     # CodePipeline
     get_pipeline_status,
     list_pipelines,
+    get_all_pipeline_statuses,
 
     # SSM / Environment Variables
     get_ssm_parameter,
@@ -59,6 +65,7 @@ Rules:
 - Always use a tool to get live data rather than guessing
 - For questions about internal docs, runbooks, or service ownership → use rag_search
 - For pipeline status questions → use get_pipeline_status (if you know the name) or list_pipelines first
+- For the status of many or all pipelines (e.g. which are failing) → use get_all_pipeline_statuses once
 - For ECS questions → use get_ecs_service_status
 - For EKS questions → use list_eks_clusters then describe_eks_cluster
 - For environment variables → use get_ssm_parameter or list_ssm_parameters
@@ -79,6 +86,9 @@ CRITICAL: When you are ready to respond to the user, you MUST use this exact for
 Thought: I now know the final answer
 Final Answer: the final answer to the original question
 
+Previous conversation with this user (empty if none):
+{chat_history}
+
 Begin!
 
 Question: {input}
@@ -88,39 +98,234 @@ prompt = PromptTemplate.from_template(SYSTEM_PROMPT)
 
 # ─────────────────────────────────────────────
 # ReAct agent — thinks in a loop, picks tools
+# Built on first use (or by the startup warmup), not at import time
 # ─────────────────────────────────────────────
-agent = create_react_agent(llm=llm, tools=tools, prompt=prompt)
+def _build_agent_executor(prompt_tools: list = tools):
+    # The prompt lists `prompt_tools`; the executor can still run any tool
+    agent = create_react_agent(llm=get_llm(), tools=prompt_tools, prompt=prompt)
+    return AgentExecutor(
+        agent=agent,
+        tools=tools,
+        verbose=False,           # Disable verbose to stop the StdOutCallback warning
+        handle_parsing_errors=True,
+        max_iterations=25,       # prevent infinite loops (increased from 8 because local mistral takes many steps)
+        return_intermediate_steps=False,
+    )
 
-# Memory — remembers last 10 messages per session
-memory = ConversationBufferWindowMemory(
-    k=10,
-    memory_key="chat_history",
-    return_messages=True
-)
 
-agent_executor = AgentExecutor(
-    agent=agent,
-    tools=tools,
-    memory=memory,
-    verbose=False,           # Disable verbose to stop the StdOutCallback warning
-    handle_parsing_errors=True,
-    max_iterations=25,       # prevent infinite loops (increased from 8 because local mistral takes many steps)
-    return_intermediate_steps=False,
-)
+def _build_agent(prompt_tools: list = tools):
+    if AGENT_MODE == "json":
+        return JsonAgent(prompt_tools, tools)
+    return _build_agent_executor(prompt_tools)
+
+
+_agent_executor = LazyComponent("agent", _build_agent)
+
+tool_selector = ToolSelector(tools, TOOL_SELECTION_TOP_K)
+
+
+@functools.lru_cache(maxsize=64)
+def _subset_executor(tool_names: tuple):
+    return _build_agent([t for t in tools if t.name in tool_names])
+
+
+def get_agent_executor(tool_names: tuple | None = None):
+    """
+    Agent for AGENT_MODE (ReAct AgentExecutor or JsonAgent) whose prompt
+    lists only `tool_names` (all tools when None).
+    """
+    if tool_names is None:
+        return _agent_executor.get()
+    return _subset_executor(tool_names)
+
+
+import asyncio
+import logging
+import time
+
+from app.agent_stats import LLMCallCounter, agent_mode_stats
+from app.answer_cache import ToolRecorder, answer_cache, question_entities
+from app.context import current_account_id, current_account_ids
+from app.fast_path import atry_fast_path, try_fast_path
+from app.memory import session_memory
+from app.metrics import AGENT_ITERATIONS, AGENT_SECONDS, MetricsCallback, RequestTrace, current_trace
+from app.regions import is_partial
+from app.streaming import StreamCancelled
+
+logger = logging.getLogger(__name__)
+
+
+def _set_account(account_id: str | None, account_ids: list[str] | None = None) -> str:
+    """
+    Set the current account(s) in contextvars for tools to read. Returns the
+    label used to key memory and the answer cache ("dev,prod" for fan-out).
+    """
+    accounts = [a for a in dict.fromkeys(account_ids or []) if a]
+    current_account_ids.set(tuple(accounts) if len(accounts) > 1 else None)
+    # With several accounts this is only a placeholder: read tools fan out and
+    # write tools refuse, so nothing acts on accounts[0] alone
+    current_account_id.set((accounts[0] if accounts else account_id) or "default")
+    return ",".join(accounts) if len(accounts) > 1 else current_account_id.get()
+
+
+def _session_key(session_id: str | None, account: str):
+    # History is per session *and* account so switching accounts starts clean
+    return (session_id, account) if session_id else None
+
+
+def _agent_inputs(user_query: str, session_key) -> dict:
+    return {"input": user_query, "chat_history": session_memory.history(session_key)}
+
+
+def _cache_vector(user_query: str, session_key):
+    """Query embedding for the answer cache, or None when the cache shouldn't be used."""
+    # Follow-ups ("what about staging?") depend on history, so only fresh questions are cached
+    if session_memory.has_history(session_key):
+        return None
+    try:
+        return answer_cache.embed(user_query)
+    except Exception as e:
+        logger.warning(f"Answer cache unavailable: {e}")
+        return None
+
+
+def _select_tools(user_query: str):
+    """Tool names for the prompt (None = all) plus the callback that counts escalations."""
+    if TOOL_SELECTION_TOP_K <= 0:
+        return None, []
+    names = tool_selector.select(user_query)
+    return names, ([EscalationWatcher(tool_selector, names)] if names else [])
+
+
+def _is_cacheable(output: str, recorder: ToolRecorder) -> bool:
+    # An answer built on partial multi-region data would hide the missing regions until it expired
+    if recorder.partial or is_partial(output):
+        return False
+    return not output.startswith(("Agent stopped", "Agent error", "I was unable to process"))
+
+
+def _finish_trace(trace: RequestTrace, token, result: dict) -> dict:
+    current_trace.reset(token)
+    summary = trace.summary()
+    AGENT_SECONDS.labels(path=result["path"]).observe(summary["total_seconds"])
+    if result["path"] == "agent":
+        AGENT_ITERATIONS.observe(summary["iterations"])
+    return {**result, "trace": summary}
+
+
+def run_agent(user_query: str, account_id: str = None, callbacks: list = None, session_id: str = None,
+              account_ids: list[str] = None) -> dict:
+    """
+    Main entry point — takes a user question, returns the answer, the
+    path that served it ("fast" for a direct tool call, "cache" for a semantic
+    answer-cache hit, "agent" for the ReAct loop) and a timing trace.
+    `callbacks` are attached to the agent run (used for streaming).
+    With several `account_ids`, read-only tools run in every account at once.
+    """
+    trace = RequestTrace()
+    token = current_trace.set(trace)
+    result = _run_agent(user_query, account_id, [*(callbacks or []), MetricsCallback(trace)], session_id, account_ids)
+    return _finish_trace(trace, token, result)
 
 
-from app.context import current_account_id
+async def arun_agent(user_query: str, account_id: str = None, callbacks: list = None, session_id: str = None,
+                     account_ids: list[str] = None) -> dict:
+    """
+    Async variant of run_agent. The LLM calls are awaited on the event loop and
+    sync boto3 tools are run in worker threads (with the account contextvar
+    copied over), so a waiting request does not pin a threadpool thread.
+    """
+    trace = RequestTrace()
+    token = current_trace.set(trace)
+    result = await _arun_agent(
+        user_query, account_id, [*(callbacks or []), MetricsCallback(trace)], session_id, account_ids
+    )
+    return _finish_trace(trace, token, result)
+
+
+def _run_agent(user_query: str, account_id: str | None, callbacks: list, session_id: str | None,
+               account_ids: list[str] | None) -> dict:
+    account = _set_account(account_id, account_ids)
+    session_key = _session_key(session_id, account)
 
-def run_agent(user_query: str, account_id: str = None) -> str:
-    """Main entry point — takes a user question, returns a string answer."""
-    # Set the current account in a contextvar for tools to read
-    if account_id:
-        current_account_id.set(account_id)
-    else:
-        current_account_id.set("default")
-        
     try:
-        result = agent_executor.invoke({"input": user_query})
-        return result.get("output", "I was unable to process that request.")
+        fast = try_fast_path(user_query)
+        if fast is not None:
+            tool_name, output = fast
+            session_memory.append(session_key, user_query, output)
+            return {"output": output, "path": "fast", "tool": tool_name}
+
+        vec = _cache_vector(user_query, session_key)
+        entities = question_entities(user_query)
+        if vec is not None:
+            cached = answer_cache.lookup(account, vec, entities)
+            if cached is not None:
+                session_memory.append(session_key, user_query, cached)
+                return {"output": cached, "path": "cache"}
+
+        tool_names, watchers = _select_tools(user_query)
+        recorder, llm_calls = ToolRecorder(), LLMCallCounter()
+        started = time.perf_counter()
+        result = get_agent_executor(tool_names).invoke(
+            _agent_inputs(user_query, session_key),
+            config={"callbacks": [*callbacks, recorder, llm_calls, *watchers]},
+        )
+        agent_mode_stats.record(AGENT_MODE, llm_calls.calls)
+        output = result.get("output", "I was unable to process that request.")
+        session_memory.append(session_key, user_query, output)
+        if vec is not None and _is_cacheable(output, recorder):
+            answer_cache.store(
+                account, vec, output, recorder.tools_used, time.perf_counter() - started, entities
+            )
+        return {"output": output, "path": "agent"}
+    except StreamCancelled:
+        # The streaming client went away; nothing failed
+        logger.info(f"Agent run cancelled by client disconnect: {user_query!r}")
+        return {"output": "", "path": "cancelled"}
+    except Exception as e:
+        logger.exception(f"Agent run failed for query: {user_query!r}")
+        return {"output": f"Agent error: {str(e)}", "path": "error"}
+
+
+async def _arun_agent(user_query: str, account_id: str | None, callbacks: list, session_id: str | None,
+                      account_ids: list[str] | None) -> dict:
+    account = _set_account(account_id, account_ids)
+    session_key = _session_key(session_id, account)
+
+    try:
+        fast = await atry_fast_path(user_query)
+        if fast is not None:
+            tool_name, output = fast
+            session_memory.append(session_key, user_query, output)
+            return {"output": output, "path": "fast", "tool": tool_name}
+
+        vec = await asyncio.to_thread(_cache_vector, user_query, session_key)
+        entities = question_entities(user_query)
+        if vec is not None:
+            cached = answer_cache.lookup(account, vec, entities)
+            if cached is not None:
+                session_memory.append(session_key, user_query, cached)
+                return {"output": cached, "path": "cache"}
+
+        tool_names, watchers = await asyncio.to_thread(_select_tools, user_query)
+        recorder, llm_calls = ToolRecorder(), LLMCallCounter()
+        started = time.perf_counter()
+        result = await get_agent_executor(tool_names).ainvoke(
+            _agent_inputs(user_query, session_key),
+            config={"callbacks": [*callbacks, recorder, llm_calls, *watchers]},
+        )
+        agent_mode_stats.record(AGENT_MODE, llm_calls.calls)
+        output = result.get("output", "I was unable to process that request.")
+        session_memory.append(session_key, user_query, output)
+        if vec is not None and _is_cacheable(output, recorder):
+            answer_cache.store(
+                account, vec, output, recorder.tools_used, time.perf_counter() - started, entities
+            )
+        return {"output": output, "path": "agent"}
+    except StreamCancelled:
+        # The streaming client went away; nothing failed
+        logger.info(f"Agent run cancelled by client disconnect: {user_query!r}")
+        return {"output": "", "path": "cancelled"}
     except Exception as e:
-        return f"Agent error: {str(e)}"
+        logger.exception(f"Agent run failed for query: {user_query!r}")
+        return {"output": f"Agent error: {str(e)}", "path": "error"}
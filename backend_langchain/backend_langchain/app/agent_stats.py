@@ -0,0 +1,36 @@
+"""LLM round trips per question answered by the agent, by agent mode."""
+import threading
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+class LLMCallCounter(BaseCallbackHandler):
+    """Counts LLM calls made during one agent run."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self.calls += 1
+
+
+class AgentModeStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._modes: dict[str, dict] = {}
+
+    def record(self, mode: str, llm_calls: int):
+        with self._lock:
+            entry = self._modes.setdefault(mode, {"questions": 0, "llm_calls": 0})
+            entry["questions"] += 1
+            entry["llm_calls"] += llm_calls
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                mode: {**e, "avg_llm_calls": round(e["llm_calls"] / e["questions"], 2)}
+                for mode, e in self._modes.items()
+            }
+
+
+agent_mode_stats = AgentModeStats()
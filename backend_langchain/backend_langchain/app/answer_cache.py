@@ -0,0 +1,168 @@
+"""
+Semantic answer cache in front of the ReAct agent.
+
+Answers are stored per account with the embedding of the question that
+produced them and the resources it names (pipeline, SSM path, cluster,
+service, EC2 filter, regions, identifier-like tokens, environment words). A new question hits when it names exactly
+the same resources and its cosine similarity to the cached question
+clears ANSWER_CACHE_THRESHOLD — embeddings alone barely separate
+"payments-prod" from "payments-staging". How long an answer stays valid
+depends on the most volatile tool the agent used to build it.
+"""
+import re
+import threading
+import time
+
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+
+from app.config import ANSWER_CACHE_MAX_ENTRIES, ANSWER_CACHE_THRESHOLD
+from app.extractors import (
+    extract_ec2_filter,
+    extract_ecs_service,
+    extract_eks_cluster_name,
+    extract_pipeline_name,
+    extract_region_scope,
+    extract_ssm_path,
+    identifier_tokens,
+)
+from app.rag import get_embedding_fn
+from app.regions import is_partial
+
+# Seconds an answer stays valid, by the tools that produced it
+TOOL_TTLS = {
+    "rag_search": 3600,
+    "list_s3_buckets": 900,
+    "list_eks_clusters": 900,
+    "describe_eks_cluster": 600,
+    "list_pipelines": 600,
+    "list_ssm_parameters": 300,
+    "get_ssm_parameter": 300,
+    "describe_ec2_instances": 120,
+    "get_pipeline_status": 30,
+    "get_all_pipeline_statuses": 30,
+    "get_ecs_service_status": 30,
+    "put_ssm_parameter": 0,  # writes are never replayed
+}
+NO_TOOL_TTL = 300
+UNKNOWN_TOOL_TTL = 60
+
+
+def answer_ttl(tools_used) -> float:
+    if not tools_used:
+        return NO_TOOL_TTL
+    return min(TOOL_TTLS.get(t, UNKNOWN_TOOL_TTL) for t in tools_used)
+
+
+_ENVIRONMENT_RE = re.compile(r"\b(prod|production|staging|stage|dev|development|qa|test|uat|sandbox)\b")
+
+
+def question_entities(query: str) -> tuple:
+    """
+    The resources a question names; a cached answer is only reused for the
+    same ones. Besides what the extractors understand, every identifier-like
+    token (payments-prod, DB_HOST, /dev/x, t3.micro) and environment word is
+    part of the key, so "payments staging" never matches "payments prod".
+    """
+    q = query.lower()
+    return (
+        extract_pipeline_name(query),
+        extract_ssm_path(query),
+        extract_eks_cluster_name(query),
+        extract_ecs_service(query),
+        extract_ec2_filter(query),
+        extract_region_scope(query),
+        frozenset(t.lower() for t in identifier_tokens(query)),
+        frozenset(_ENVIRONMENT_RE.findall(q)),
+    )
+
+
+class ToolRecorder(BaseCallbackHandler):
+    """Collects the names of tools the agent called during one run, and whether any came back partial."""
+
+    def __init__(self):
+        self.tools_used = set()
+        self.partial = False
+
+    def on_tool_start(self, serialized, input_str, **kwargs):
+        self.tools_used.add(serialized.get("name", "unknown"))
+
+    def on_tool_end(self, output, **kwargs):
+        self.partial = self.partial or is_partial(output)
+
+
+class SemanticAnswerCache:
+    def __init__(self, threshold: float, max_entries: int):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries: dict[str, list[dict]] = {}  # account -> entries, oldest first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_llm_seconds = 0.0
+
+    @staticmethod
+    def embed(query: str) -> np.ndarray:
+        vec = np.asarray(get_embedding_fn().embed_query(query.strip().lower()), dtype=np.float32)
+        return vec / (np.linalg.norm(vec) or 1.0)
+
+    def lookup(self, account_id: str, vec: np.ndarray, entities: tuple = ()):
+        """Cached answer for the closest live question about the same `entities` above threshold, else None."""
+        now = time.monotonic()
+        with self._lock:
+            entries = [e for e in self._entries.get(account_id, []) if e["expires_at"] > now]
+            self._entries[account_id] = entries
+            candidates = [e for e in entries if e["entities"] == entities]
+            if candidates:
+                scores = np.stack([e["vec"] for e in candidates]) @ vec
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    self.hits += 1
+                    self.saved_llm_seconds += candidates[best]["llm_seconds"]
+                    return candidates[best]["answer"]
+            self.misses += 1
+            return None
+
+    def store(self, account_id: str, vec: np.ndarray, answer: str, tools_used, llm_seconds: float,
+              entities: tuple = ()):
+        ttl = answer_ttl(tools_used)
+        if ttl <= 0:
+            return
+        with self._lock:
+            entries = self._entries.setdefault(account_id, [])
+            entries.append({
+                "vec": vec,
+                "answer": answer,
+                "tools": frozenset(tools_used),
+                "entities": entities,
+                "expires_at": time.monotonic() + ttl,
+                "llm_seconds": llm_seconds,
+            })
+            if len(entries) > self.max_entries:
+                del entries[: len(entries) - self.max_entries]
+
+    def invalidate(self, account_id: str, tools):
+        """Drop answers built from any of `tools` for `account_id` (incl. fan-out labels naming it)."""
+        tools = set(tools)
+        with self._lock:
+            for key, entries in self._entries.items():
+                if account_id in key.split(","):
+                    entries[:] = [e for e in entries if tools.isdisjoint(e["tools"])]
+
+    def flush(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": sum(len(v) for v in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "saved_llm_seconds": round(self.saved_llm_seconds, 1),
+            }
+
+
+answer_cache = SemanticAnswerCache(ANSWER_CACHE_THRESHOLD, ANSWER_CACHE_MAX_ENTRIES)
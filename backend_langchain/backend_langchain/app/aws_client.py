@@ -1,26 +1,176 @@
 import boto3
-from app.context import current_account_id
+import threading
+from botocore.config import Config
+from datetime import datetime, timedelta, timezone
+from app.config import (
+    AWS_CONNECT_TIMEOUT_SECONDS,
+    AWS_MAX_POOL_CONNECTIONS,
+    AWS_READ_TIMEOUT_SECONDS,
+    REGION_SCAN_MAX_ATTEMPTS,
+    REGION_SCAN_TIMEOUT_SECONDS,
+    STS_REFRESH_MARGIN_SECONDS,
+)
+from app.context import current_account_id, in_region_scan
+from app.metrics import STS_SECONDS, timed
 import logging
 
 logger = logging.getLogger(__name__)
 
+# ─────────────────────────────────────────────
+# Assumed-role credential cache + client pool
+# STS credentials are reused per account until shortly before they
+# expire, and clients are reused per (account, service, region).
+# boto3 clients are thread-safe, so one client can serve every request,
+# but creating them from a shared Session is not: every client is built
+# from one dedicated Session under _session_lock (once per key, so cheap).
+# ─────────────────────────────────────────────
+_lock = threading.Lock()
+_session = boto3.session.Session()
+_session_lock = threading.Lock()
+_sts_client = None
+_account_locks: dict[str, threading.Lock] = {}
+_credentials: dict[str, dict] = {}
+_clients: dict[tuple, tuple] = {}
+
+# Bounded timeouts so an unreachable endpoint can't hold a worker for minutes
+_client_config = Config(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    connect_timeout=AWS_CONNECT_TIMEOUT_SECONDS,
+    read_timeout=AWS_READ_TIMEOUT_SECONDS,
+)
+# Region-scan workers (app.regions) give up within the scan deadline instead of
+# retrying long after the scan has reported the region as timed out
+_scan_client_config = Config(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    connect_timeout=min(AWS_CONNECT_TIMEOUT_SECONDS, REGION_SCAN_TIMEOUT_SECONDS),
+    read_timeout=min(AWS_READ_TIMEOUT_SECONDS, REGION_SCAN_TIMEOUT_SECONDS),
+    retries={"max_attempts": REGION_SCAN_MAX_ATTEMPTS, "mode": "standard"},
+)
+
+# Offline benchmarks (app/bench) route clients through a fake; None = real boto3
+_client_factory = None
+
+_stats = {
+    "sts_calls": 0,
+    "sts_failures": 0,
+    "credential_hits": 0,
+    "credential_misses": 0,
+    "client_hits": 0,
+    "client_misses": 0,
+}
+
+
+def _incr(key: str):
+    with _lock:
+        _stats[key] += 1
+
+
+def _account_lock(account_id: str) -> threading.Lock:
+    with _lock:
+        return _account_locks.setdefault(account_id, threading.Lock())
+
+
+def _is_fresh(creds: dict) -> bool:
+    margin = timedelta(seconds=STS_REFRESH_MARGIN_SECONDS)
+    return creds["Expiration"] - margin > datetime.now(timezone.utc)
+
+
+def _get_sts_client():
+    global _sts_client
+    with _session_lock:
+        if _sts_client is None:
+            _sts_client = _session.client('sts')
+        return _sts_client
+
+
+def _get_credentials(account_id: str) -> dict:
+    """Return cached STS credentials for the account, assuming the role when missing or near expiry."""
+    creds = _credentials.get(account_id)
+    if creds and _is_fresh(creds):
+        _incr("credential_hits")
+        return creds
+
+    # One STS call per account at a time — concurrent callers wait and reuse the result
+    with _account_lock(account_id):
+        creds = _credentials.get(account_id)
+        if creds and _is_fresh(creds):
+            _incr("credential_hits")
+            return creds
+
+        _incr("credential_misses")
+        _incr("sts_calls")
+        sts = _get_sts_client()
+        role_arn = f'arn:aws:iam::{account_id}:role/CloudAgentAccessRole'
+        logger.info(f'Assuming role {role_arn}')
+        with timed(STS_SECONDS, "sts"):
+            resp = sts.assume_role(RoleArn=role_arn, RoleSessionName='CloudAgentSession')
+        creds = resp['Credentials']
+        _credentials[account_id] = creds
+        return creds
+
+
+def _pooled_client(key: tuple, creds_id: str | None, factory):
+    with _lock:
+        entry = _clients.get(key)
+        if entry and entry[1] == creds_id:
+            _stats["client_hits"] += 1
+            return entry[0]
+
+    with _session_lock:
+        # Another thread may have built it while we waited
+        with _lock:
+            entry = _clients.get(key)
+            if entry and entry[1] == creds_id:
+                _stats["client_hits"] += 1
+                return entry[0]
+            _stats["client_misses"] += 1
+        client = factory()
+        with _lock:
+            _clients[key] = (client, creds_id)
+    return client
+
+
+def set_client_factory(factory):
+    """Serve get_boto_client from factory(service_name, region_name) instead of boto3; None restores boto3."""
+    global _client_factory
+    _client_factory = factory
+
+
 def get_boto_client(service_name: str, region_name: str = None):
+    if _client_factory is not None:
+        return _client_factory(service_name, region_name)
     account_id = current_account_id.get()
+    scan = in_region_scan.get()
+    config = _scan_client_config if scan else _client_config
     if account_id and account_id != 'default':
         try:
-            sts = boto3.client('sts')
-            role_arn = f'arn:aws:iam::{account_id}:role/CloudAgentAccessRole'
-            logger.info(f'Assuming role {role_arn} for {service_name}')
-            resp = sts.assume_role(RoleArn=role_arn, RoleSessionName='CloudAgentSession')
-            creds = resp['Credentials']
-            return boto3.client(
-                service_name,
-                aws_access_key_id=creds['AccessKeyId'],
-                aws_secret_access_key=creds['SecretAccessKey'],
-                aws_session_token=creds['SessionToken'],
-                region_name=region_name
+            creds = _get_credentials(account_id)
+            return _pooled_client(
+                (account_id, service_name, region_name, scan),
+                creds['AccessKeyId'],
+                lambda: _session.client(
+                    service_name,
+                    aws_access_key_id=creds['AccessKeyId'],
+                    aws_secret_access_key=creds['SecretAccessKey'],
+                    aws_session_token=creds['SessionToken'],
+                    region_name=region_name,
+                    config=config,
+                ),
             )
         except Exception as e:
+            _incr("sts_failures")
             logger.error(f'Failed to assume role for account {account_id}, using default account fallback! Error: {e}')
-            return boto3.client(service_name, region_name=region_name)
-    return boto3.client(service_name, region_name=region_name)
\ No newline at end of file
+    return _pooled_client(
+        ('default', service_name, region_name, scan),
+        None,
+        lambda: _session.client(service_name, region_name=region_name, config=config),
+    )
+
+
+def get_client_cache_stats() -> dict:
+    """Snapshot of credential/client cache counters."""
+    with _lock:
+        stats = dict(_stats)
+        stats["cached_accounts"] = len(_credentials)
+        stats["pooled_clients"] = len(_clients)
+    return stats
@@ -0,0 +1,238 @@
+"""
+In-memory stand-ins for the boto3 clients the tools use, with a
+configurable fleet size and per-call latency. Installed with
+app.aws_client.set_client_factory(FakeAWS(...).client).
+
+Only the calls and response fields the tools in app/services read are
+modelled; anything else raises AttributeError just like a typo would.
+"""
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+REGION = "us-east-1"
+ACCOUNT = "111122223333"
+
+
+@dataclass
+class Fleet:
+    buckets: int = 50
+    instances: int = 2000
+    pipelines: int = 100
+    ecs_services: int = 20
+    eks_clusters: int = 5
+    ssm_parameters: int = 200
+    api_latency_ms: float = 20.0  # per AWS call (per page for paginated calls)
+    seed: int = 7
+
+
+class _Paginator:
+    def __init__(self, pages_fn):
+        self._pages_fn = pages_fn
+
+    def paginate(self, **kwargs):
+        return self._pages_fn(**kwargs)
+
+
+class _FakeClient:
+    def __init__(self, aws: "FakeAWS"):
+        self._aws = aws
+
+    def _call(self):
+        self._aws.record_call()
+        if self._aws.fleet.api_latency_ms:
+            time.sleep(self._aws.fleet.api_latency_ms / 1000)
+
+    def get_paginator(self, operation: str):
+        return _Paginator(getattr(self, f"_paginate_{operation}"))
+
+
+class _S3(_FakeClient):
+    def list_buckets(self):
+        self._call()
+        return {"Buckets": [{"Name": name} for name in self._aws.buckets]}
+
+
+class _EC2(_FakeClient):
+    def _paginate_describe_instances(self, Filters=(), PaginationConfig=None):
+        size = (PaginationConfig or {}).get("PageSize", 1000)
+        wanted = {f["Name"]: f["Values"] for f in Filters}
+        rows = [i for i in self._aws.instances if _matches(i, wanted)]
+        for start in range(0, max(len(rows), 1), size):
+            self._call()
+            yield {"Reservations": [{"Instances": rows[start:start + size]}]}
+
+
+def _matches(inst: dict, wanted: dict) -> bool:
+    if "instance-state-name" in wanted and inst["State"]["Name"] not in wanted["instance-state-name"]:
+        return False
+    if "instance-type" in wanted and inst["InstanceType"] not in wanted["instance-type"]:
+        return False
+    if "tag:Name" in wanted:
+        name = inst["Tags"][0]["Value"]
+        patterns = [p.strip("*") for p in wanted["tag:Name"]]
+        if not any(p in name for p in patterns):
+            return False
+    return True
+
+
+class _ECS(_FakeClient):
+    def describe_services(self, cluster, services):
+        self._call()
+        found = [self._aws.ecs_services[s] for s in services if s in self._aws.ecs_services]
+        return {"services": found}
+
+
+class _EKS(_FakeClient):
+    def list_clusters(self):
+        self._call()
+        return {"clusters": list(self._aws.eks_clusters)}
+
+    def describe_cluster(self, name):
+        self._call()
+        if name not in self._aws.eks_clusters:
+            raise ValueError(f"ResourceNotFoundException: No cluster found for name: {name}.")
+        return {"cluster": self._aws.eks_clusters[name]}
+
+
+class _CodePipeline(_FakeClient):
+    def _paginate_list_pipelines(self):
+        names = list(self._aws.pipelines)
+        for start in range(0, max(len(names), 1), 100):
+            self._call()
+            yield {"pipelines": [{"name": n} for n in names[start:start + 100]]}
+
+    def get_pipeline_state(self, name):
+        self._call()
+        return self._aws.pipelines[name]["state"]
+
+    def get_pipeline(self, name):
+        self._call()
+        return self._aws.pipelines[name]["definition"]
+
+
+class _SSM(_FakeClient):
+    def get_parameter(self, Name, WithDecryption=False):
+        self._call()
+        if Name not in self._aws.parameters:
+            raise ValueError(f"ParameterNotFound: {Name}")
+        return {"Parameter": {"Name": Name, "Value": self._aws.parameters[Name]}}
+
+    def get_parameters_by_path(self, Path, Recursive=False):
+        self._call()
+        return {"Parameters": [{"Name": n} for n in self._aws.parameters if n.startswith(Path)]}
+
+    def put_parameter(self, Name, Value, Type="String", Overwrite=False):
+        self._call()
+        self._aws.parameters[Name] = Value
+        return {"Version": 1}
+
+
+_SERVICES = {"s3": _S3, "ec2": _EC2, "ecs": _ECS, "eks": _EKS, "codepipeline": _CodePipeline, "ssm": _SSM}
+
+
+class FakeAWS:
+    """A synthetic account; `client(service, region)` matches get_boto_client's signature."""
+
+    def __init__(self, fleet: Fleet = None):
+        self.fleet = fleet or Fleet()
+        rnd = random.Random(self.fleet.seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self._clients = {}
+
+        teams = ["payments", "orders", "users", "search", "billing", "auth", "catalog", "inventory"]
+        self.buckets = [f"{rnd.choice(teams)}-data-{i}" for i in range(self.fleet.buckets)]
+
+        launched = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.instances = [
+            {
+                "InstanceId": f"i-{i:017x}",
+                "InstanceType": rnd.choice(["t3.micro", "t3.medium", "m5.large", "c5.xlarge"]),
+                "State": {"Name": rnd.choices(["running", "stopped", "pending"], weights=[8, 2, 1])[0]},
+                "Tags": [{"Key": "Name", "Value": f"{rnd.choice(teams)}-{rnd.choice(['api', 'worker', 'db'])}-{i}"}],
+                "LaunchTime": launched + timedelta(minutes=i),
+            }
+            for i in range(self.fleet.instances)
+        ]
+
+        self.pipelines = {}
+        for i in range(self.fleet.pipelines):
+            name = f"{teams[i % len(teams)]}-{['prod', 'staging', 'dev'][i // len(teams) % 3]}" + (f"-{i}" if i >= 3 * len(teams) else "")
+            self.pipelines[name] = self._pipeline(name, rnd)
+
+        self.ecs_services = {
+            f"{teams[i % len(teams)]}-service" + (f"-{i}" if i >= len(teams) else ""): None
+            for i in range(self.fleet.ecs_services)
+        }
+        for name in self.ecs_services:
+            desired = rnd.randint(1, 6)
+            self.ecs_services[name] = {
+                "serviceName": name,
+                "status": "ACTIVE",
+                "desiredCount": desired,
+                "runningCount": desired - rnd.choice([0, 0, 0, 1]),
+                "pendingCount": rnd.choice([0, 0, 1]),
+                "taskDefinition": f"arn:aws:ecs:{REGION}:{ACCOUNT}:task-definition/{name}:{rnd.randint(1, 90)}",
+            }
+
+        self.eks_clusters = {
+            f"{env}-cluster" + (f"-{i}" if i >= 3 else ""): {
+                "name": f"{env}-cluster" + (f"-{i}" if i >= 3 else ""),
+                "status": "ACTIVE",
+                "version": rnd.choice(["1.28", "1.29", "1.30"]),
+                "endpoint": f"https://{i:08X}.gr7.{REGION}.eks.amazonaws.com",
+                "arn": f"arn:aws:eks:{REGION}:{ACCOUNT}:cluster/{env}-cluster-{i}",
+            }
+            for i, env in ((i, ["prod", "staging", "dev"][i % 3]) for i in range(self.fleet.eks_clusters))
+        }
+
+        self.parameters = {
+            f"/{rnd.choice(['prod', 'staging', 'dev'])}/{rnd.choice(teams)}/setting_{i}": f"value-{i}"
+            for i in range(self.fleet.ssm_parameters)
+        }
+
+    @staticmethod
+    def _pipeline(name: str, rnd: random.Random) -> dict:
+        status = rnd.choices(["Succeeded", "Failed", "InProgress"], weights=[7, 2, 1])[0]
+        changed = datetime(2024, 6, 1, tzinfo=timezone.utc) + timedelta(minutes=rnd.randint(0, 50000))
+        return {
+            "state": {
+                "stageStates": [
+                    {
+                        "stageName": "Source",
+                        "latestExecution": {"status": "Succeeded", "lastStatusChange": changed},
+                        "actionStates": [{"latestExecution": {"externalExecutionId": f"{rnd.getrandbits(160):040x}"}}],
+                    },
+                    {"stageName": "Deploy", "latestExecution": {"status": status, "lastStatusChange": changed}},
+                ]
+            },
+            "definition": {
+                "pipeline": {
+                    "stages": [
+                        {
+                            "name": "Source",
+                            "actions": [{
+                                "actionTypeId": {"provider": "CodeStarSourceConnection"},
+                                "configuration": {"FullRepositoryId": f"acme/{name.split('-')[0]}", "BranchName": "main"},
+                            }],
+                        },
+                        {"name": "Deploy", "actions": []},
+                    ]
+                }
+            },
+        }
+
+    def record_call(self):
+        with self._lock:
+            self.calls += 1
+
+    def client(self, service_name: str, region_name: str = None):
+        if service_name not in _SERVICES:
+            raise ValueError(f"FakeAWS does not model '{service_name}'")
+        with self._lock:
+            if service_name not in self._clients:
+                self._clients[service_name] = _SERVICES[service_name](self)
+            return self._clients[service_name]
@@ -0,0 +1,170 @@
+"""
+A local stand-in for Ollama's /api/generate that replays scripted agent
+transcripts token by token.
+
+The question is read back out of the prompt and matched against the
+scripts; how many tool steps have already happened is counted from the
+scratchpad, so the server is stateless and any number of agent runs can
+be in flight at once. Replies are rendered as ReAct text, or as JSON
+steps when the request asks for format=json (AGENT_MODE=json).
+
+Latency model: `prefill_ms_per_1k` per 1k prompt tokens before the first
+token (so a bigger prompt costs more, as on CPU Ollama), then
+`token_latency_ms` per generated token.
+"""
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+
+@dataclass
+class Script:
+    """`steps` is a list of tool-call groups; each group is [(tool, tool_input), ...]."""
+    question: str
+    steps: list = field(default_factory=list)
+    final: str = "Done."
+
+    def matches(self, question: str) -> bool:
+        return question.strip().lower() == self.question.strip().lower()
+
+
+def _question_and_tail(prompt: str) -> tuple[str, str]:
+    idx = prompt.rfind("Question: ")
+    if idx == -1:
+        return "", ""
+    tail = prompt[idx:]
+    return tail[len("Question: "):].split("\n", 1)[0], tail
+
+
+def render_reply(script: Script | None, prompt: str, json_mode: bool) -> str:
+    """The model's next reply for this prompt under `script`."""
+    _, tail = _question_and_tail(prompt)
+    final = script.final if script else "I don't have a scripted answer for that."
+    if json_mode:
+        done = tail.count('"tool_calls"')
+        steps = script.steps if script else []
+        if done >= len(steps):
+            return json.dumps({"thought": "I now know the final answer", "final_answer": final})
+        calls = [{"tool": t, "tool_input": i} for t, i in steps[done]]
+        if len(calls) == 1:
+            return json.dumps({"thought": f"I should call {calls[0]['tool']}.", **calls[0]})
+        return json.dumps({"thought": f"I can run {len(calls)} lookups at once.", "tool_calls": calls})
+
+    done = tail.count("\nObservation:")
+    calls = [c for group in (script.steps if script else []) for c in group]
+    if done >= len(calls):
+        return f"Thought: I now know the final answer\nFinal Answer: {final}"
+    tool, tool_input = calls[done]
+    return f"Thought: I should use {tool}.\nAction: {tool}\nAction Input: {tool_input}"
+
+
+class FakeOllama:
+    def __init__(self, scripts: list[Script], token_latency_ms: float = 20.0, prefill_ms_per_1k: float = 400.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.scripts = scripts
+        self.token_latency = token_latency_ms / 1000
+        self.prefill_per_token = prefill_ms_per_1k / 1000 / 1000
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def script_for(self, prompt: str) -> Script | None:
+        question, _ = _question_and_tail(prompt)
+        return next((s for s in self.scripts if s.matches(question)), None)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _handler(fake: FakeOllama):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, body: dict, status: int = 200):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/api/tags":
+                self._send_json({"models": [{"name": "mistral:latest"}]})
+            else:
+                self._send_json({"status": "Ollama is running"})
+
+        def do_POST(self):
+            if self.path != "/api/generate":
+                self._send_json({"error": f"{self.path} not supported by the fake"}, 404)
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            prompt = body.get("prompt", "")
+            with fake._lock:
+                fake.calls += 1
+
+            reply = render_reply(fake.script_for(prompt), prompt, body.get("format") == "json") if prompt else ""
+            tokens = _TOKEN_RE.findall(reply)
+            prompt_tokens = len(prompt) // 4 + 1
+            started = time.perf_counter()
+            time.sleep(prompt_tokens * fake.prefill_per_token)
+
+            def chunk(text, done=False):
+                out = {
+                    "model": body.get("model", "mistral"),
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "response": text,
+                    "done": done,
+                }
+                if done:
+                    out.update({
+                        "done_reason": "stop",
+                        "total_duration": int((time.perf_counter() - started) * 1e9),
+                        "prompt_eval_count": prompt_tokens,
+                        "eval_count": len(tokens),
+                    })
+                return out
+
+            if not body.get("stream", True):
+                time.sleep(len(tokens) * fake.token_latency)
+                self._send_json(chunk(reply, done=True))
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for token in tokens:
+                time.sleep(fake.token_latency)
+                self._write_chunk(chunk(token))
+            self._write_chunk(chunk("", done=True))
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _write_chunk(self, body: dict):
+            data = json.dumps(body).encode() + b"\n"
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
@@ -0,0 +1,174 @@
+"""
+Offline benchmark: the real FastAPI app, agent loop and tool code, driven
+over HTTP against a fake AWS account and a fake Ollama server.
+
+Usage (from the directory containing `app/`):
+    python -m app.bench.run
+    python -m app.bench.run --scenarios single_tool,multi_tool --concurrency 1,4,16 --requests 40
+    python -m app.bench.run --agent-mode json --token-ms 30 --instances 20000 --json results.json
+
+Reports throughput and p50/p95/p99 latency per scenario and concurrency
+level. Caches are flushed before each level so every level starts cold.
+
+The embedding model must already be in the local Hugging Face cache; the
+run stops at startup if it can't be loaded. AWS clients come from the fake
+via set_client_factory, which bypasses the STS credential cache and the
+client pool in app.aws_client, so those paths are not measured here.
+"""
+import argparse
+import json
+import math
+import os
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # nearest-rank
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark /api/execute against fake AWS and a fake Ollama.")
+    parser.add_argument("--scenarios", default="", help="comma-separated (default: all but rag)")
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--requests", type=int, default=32, help="requests per scenario and concurrency level")
+    parser.add_argument("--agent-mode", choices=["react", "json"], default="react")
+    parser.add_argument("--tool-top-k", type=int, default=None, help="TOOL_SELECTION_TOP_K (0 = all tools)")
+    parser.add_argument("--token-ms", type=float, default=20.0, help="fake model latency per generated token")
+    parser.add_argument("--prefill-ms", type=float, default=400.0, help="fake model latency per 1k prompt tokens")
+    parser.add_argument("--aws-ms", type=float, default=20.0, help="fake AWS latency per call/page")
+    parser.add_argument("--instances", type=int, default=2000)
+    parser.add_argument("--pipelines", type=int, default=100)
+    parser.add_argument("--with-rag", action="store_true", help="include the rag scenario (needs the embedding model)")
+    parser.add_argument("--json", help="also write results to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = _parse_args()
+
+    # Everything below must be configured before the app modules are imported
+    from app.bench.fake_aws import FakeAWS, Fleet
+    from app.bench.fake_ollama import FakeOllama
+    from app.bench.scenarios import DEFAULT_SCENARIOS, SCENARIOS, all_scripts
+
+    ollama = FakeOllama(all_scripts(), token_latency_ms=args.token_ms, prefill_ms_per_1k=args.prefill_ms).start()
+    os.environ["OLLAMA_BASE_URL"] = ollama.base_url
+    os.environ["AGENT_MODE"] = args.agent_mode
+    os.environ["WARMUP_ENABLED"] = "false"
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")  # fail fast instead of downloading models
+    if args.tool_top_k is not None:
+        os.environ["TOOL_SELECTION_TOP_K"] = str(args.tool_top_k)
+
+    import requests
+    import uvicorn
+
+    from app.answer_cache import answer_cache
+    from app.aws_client import set_client_factory
+    from app.cache import flush_caches
+    from app.main import app
+    from app.rag import get_embedding_fn
+
+    # Tool selection and the answer cache embed every query; without the model
+    # each request would retry the load and fail, so stop here instead
+    try:
+        get_embedding_fn()
+    except Exception as e:
+        print(f"Could not load the embedding model ({e}). Run once with network access "
+              f"or HF_HUB_OFFLINE=0 to populate the Hugging Face cache.", file=sys.stderr)
+        ollama.stop()
+        return 1
+
+    aws = FakeAWS(Fleet(instances=args.instances, pipelines=args.pipelines, api_latency_ms=args.aws_ms))
+    set_client_factory(aws.client)
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    url = f"http://127.0.0.1:{port}/api/execute"
+
+    names = [n for n in args.scenarios.split(",") if n] or DEFAULT_SCENARIOS + (["rag"] if args.with_rag else [])
+    levels = [int(c) for c in args.concurrency.split(",")]
+    print(f"agent_mode={args.agent_mode} token_ms={args.token_ms} prefill_ms/1k={args.prefill_ms} "
+          f"aws_ms={args.aws_ms} instances={args.instances} pipelines={args.pipelines}\n")
+    print(f"{'scenario':<12} {'conc':>4} {'req/s':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+          f"{'errors':>6} {'llm/req':>7} {'aws/req':>7}  paths")
+
+    results = []
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=max(levels)))
+    for name in names:
+        questions = [s.question for s in SCENARIOS[name]]
+        for concurrency in levels:
+            flush_caches()
+            answer_cache.flush()
+            llm_before, aws_before = ollama.calls, aws.calls
+            paths, latencies, errors = Counter(), [], 0
+            lock = threading.Lock()
+
+            def one(i):
+                nonlocal errors
+                started = time.perf_counter()
+                try:
+                    resp = session.post(url, json={"command": questions[i % len(questions)]}, timeout=600)
+                    ok = resp.status_code == 200
+                    path = resp.json().get("path", "error") if ok else f"http_{resp.status_code}"
+                except requests.RequestException:
+                    ok, path = False, "exception"
+                elapsed = time.perf_counter() - started
+                with lock:
+                    paths[path] += 1
+                    if ok and path != "error":
+                        latencies.append(elapsed)
+                    else:
+                        errors += 1
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(one, range(args.requests)))
+            wall = time.perf_counter() - started
+
+            row = {
+                "scenario": name,
+                "concurrency": concurrency,
+                "requests": args.requests,
+                "throughput": round(len(latencies) / wall, 2) if wall else 0.0,
+                "p50": round(_percentile(latencies, 50), 3),
+                "p95": round(_percentile(latencies, 95), 3),
+                "p99": round(_percentile(latencies, 99), 3),
+                "errors": errors,
+                "llm_calls_per_request": round((ollama.calls - llm_before) / args.requests, 2),
+                "aws_calls_per_request": round((aws.calls - aws_before) / args.requests, 2),
+                "paths": dict(paths),
+            }
+            results.append(row)
+            print(f"{name:<12} {concurrency:>4} {row['throughput']:>7} {row['p50']:>7} {row['p95']:>7} {row['p99']:>7} "
+                  f"{errors:>6} {row['llm_calls_per_request']:>7} {row['aws_calls_per_request']:>7}  "
+                  + ", ".join(f"{p}={n}" for p, n in paths.items()))
+
+    server.should_exit = True
+    ollama.stop()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
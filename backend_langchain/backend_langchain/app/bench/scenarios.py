@@ -0,0 +1,62 @@
+"""
+Benchmark scenarios: the questions sent to /api/execute and the transcripts
+the fake model replays for them. Names and fleets match app.bench.fake_aws.
+"""
+from app.bench.fake_ollama import Script
+
+SCENARIOS = {
+    # Answered by app.fast_path — no LLM round trip
+    "fast_path": [
+        Script("list s3 buckets"),
+        Script("list eks clusters"),
+        Script("status of pipeline payments-prod"),
+        Script("show running t3.micro instances"),
+    ],
+    # One tool call, two LLM hops
+    "single_tool": [
+        Script(
+            "why is the payments-prod pipeline failing?",
+            [[("get_pipeline_status", "payments-prod")]],
+            "The payments-prod pipeline's latest run is shown above; check the Deploy stage logs.",
+        ),
+        Script(
+            "explain the state of the orders-service ecs service",
+            [[("get_ecs_service_status", "orders-service")]],
+            "orders-service is ACTIVE and running its desired task count.",
+        ),
+    ],
+    # Several independent lookups: N hops in react mode, one in json mode
+    "multi_tool": [
+        Script(
+            "compare the payments-prod, orders-prod and users-prod pipelines",
+            [[
+                ("get_pipeline_status", "payments-prod"),
+                ("get_pipeline_status", "orders-prod"),
+                ("get_pipeline_status", "users-prod"),
+            ]],
+            "All three pipelines are summarised above.",
+        ),
+    ],
+    # Tool work dominated by a large EC2 fleet
+    "large_fleet": [
+        Script(
+            "how should we right-size our ec2 fleet?",
+            [[("describe_ec2_instances", "")], [("describe_ec2_instances", "running")]],
+            "Most running capacity is in t3.medium and m5.large; start with the stopped instances.",
+        ),
+    ],
+    # Needs the embedding model plus an index snapshot or Chroma (--with-rag)
+    "rag": [
+        Script(
+            "how do we roll back a bad deployment according to the runbook?",
+            [[("rag_search", "roll back deployment runbook")]],
+            "Follow the rollback steps from the runbook above.",
+        ),
+    ],
+}
+
+DEFAULT_SCENARIOS = ["fast_path", "single_tool", "multi_tool", "large_fleet"]
+
+
+def all_scripts() -> list[Script]:
+    return [script for scripts in SCENARIOS.values() for script in scripts]
@@ -0,0 +1,115 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import TOOL_CACHE_MAX_ENTRIES
+from app.context import current_account_id
+from app.regions import is_partial
+
+# Every cache registers itself here so stats and flushes can cover them all
+_registry: dict[str, "TTLCache"] = {}
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a TTL (seconds)."""
+
+    def __init__(self, name: str, ttl: float, maxsize: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry[name] = self
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl: float | None = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, predicate=None) -> int:
+        """Drop entries whose key matches predicate (all entries when None)."""
+        with self._lock:
+            keys = [k for k in self._data if predicate is None or predicate(k)]
+            for k in keys:
+                del self._data[k]
+        return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def get_cache_stats() -> dict:
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+def flush_caches(prefix: str | None = None) -> dict:
+    """Empty every registered cache (or those whose name starts with prefix)."""
+    return {
+        name: cache.invalidate()
+        for name, cache in _registry.items()
+        if prefix is None or name.startswith(prefix)
+    }
+
+
+def cached_tool(name: str, ttl: float, maxsize: int = TOOL_CACHE_MAX_ENTRIES):
+    """
+    Cache a tool function's result per account and input for `ttl` seconds.
+    Goes *under* @tool. Keys are (account_id, *inputs); error strings and
+    partial multi-region results are not cached. The cache is reachable as `<tool>.func.cache` for invalidation.
+    """
+    cache = TTLCache(f"tool:{name}", ttl=ttl, maxsize=maxsize)
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            inputs = args + tuple(v for _, v in sorted(kwargs.items()))
+            key = (current_account_id.get(), *(v.strip() if isinstance(v, str) else v for v in inputs))
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = fn(*args, **kwargs)
+                if not (isinstance(result, str) and result.startswith("Error")) and not is_partial(result):
+                    cache.set(key, result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
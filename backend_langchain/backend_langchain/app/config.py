@@ -8,3 +8,79 @@ OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://llm:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "mistral")
 CHROMA_HOST = os.getenv("CHROMA_HOST", "chroma")
 CHROMA_PORT = int(os.getenv("CHROMA_PORT", "8000"))
+
+# Refresh assumed-role credentials this many seconds before STS expiry
+STS_REFRESH_MARGIN_SECONDS = int(os.getenv("STS_REFRESH_MARGIN_SECONDS", "300"))
+
+# CodePipeline caches — definitions rarely change, state is polled on deploy day
+PIPELINE_DEFINITION_TTL_SECONDS = int(os.getenv("PIPELINE_DEFINITION_TTL_SECONDS", "600"))
+PIPELINE_STATE_TTL_SECONDS = int(os.getenv("PIPELINE_STATE_TTL_SECONDS", "15"))
+
+# Worker threads used to fetch pipeline states for the fleet overview
+PIPELINE_STATUS_WORKERS = int(os.getenv("PIPELINE_STATUS_WORKERS", "16"))
+
+# HTTP connections each boto3 client keeps open — must cover the widest worker pool
+AWS_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "32"))
+
+# Instance rows returned by describe_ec2_instances; the rest are summarised as counts
+EC2_MAX_ROWS = int(os.getenv("EC2_MAX_ROWS", "25"))
+
+# Admission control for agent runs — local Ollama only serves a few at once
+MAX_CONCURRENT_AGENT_RUNS = int(os.getenv("MAX_CONCURRENT_AGENT_RUNS", "4"))
+AGENT_QUEUE_SIZE = int(os.getenv("AGENT_QUEUE_SIZE", "32"))
+
+# Per-session conversation memory
+MEMORY_MAX_SESSIONS = int(os.getenv("MEMORY_MAX_SESSIONS", "1000"))
+MEMORY_MAX_TURNS = int(os.getenv("MEMORY_MAX_TURNS", "5"))
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "600"))
+MEMORY_IDLE_TTL_SECONDS = int(os.getenv("MEMORY_IDLE_TTL_SECONDS", "3600"))
+
+# Semantic answer cache in front of the agent
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92"))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "500"))
+
+# Per-tool result cache TTLs (seconds)
+TOOL_CACHE_LONG_TTL_SECONDS = int(os.getenv("TOOL_CACHE_LONG_TTL_SECONDS", "600"))      # S3 / EKS / pipeline listings
+TOOL_CACHE_MEDIUM_TTL_SECONDS = int(os.getenv("TOOL_CACHE_MEDIUM_TTL_SECONDS", "120"))  # SSM, EC2
+TOOL_CACHE_SHORT_TTL_SECONDS = int(os.getenv("TOOL_CACHE_SHORT_TTL_SECONDS", "15"))     # ECS
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "256"))
+
+# Background warmup at startup
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_RETRY_SECONDS = int(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+WARMUP_MAX_ATTEMPTS = int(os.getenv("WARMUP_MAX_ATTEMPTS", "12"))
+
+# Query embedding service
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))
+EMBEDDING_MAX_BATCH = int(os.getenv("EMBEDDING_MAX_BATCH", "32"))
+EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))
+EMBEDDING_QUANTIZE = os.getenv("EMBEDDING_QUANTIZE", "")  # "int8" for dynamic int8 CPU inference
+
+# In-process vector index snapshot (see app/export_index.py)
+INDEX_SNAPSHOT_DIR = os.getenv("INDEX_SNAPSHOT_DIR", "./index_snapshot")
+INDEX_REFRESH_SECONDS = int(os.getenv("INDEX_REFRESH_SECONDS", "30"))
+
+# RAG context: candidates retrieved, then merged/de-duplicated into this many tokens
+RAG_CANDIDATES = int(os.getenv("RAG_CANDIDATES", "8"))
+RAG_CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_TOKENS", "600"))
+
+# Tools rendered into the agent prompt per request (0 = always all tools)
+TOOL_SELECTION_TOP_K = int(os.getenv("TOOL_SELECTION_TOP_K", "4"))
+
+# Agent loop: "react" (free-text ReAct) or "json" (format-constrained JSON steps, see app/json_agent.py)
+AGENT_MODE = os.getenv("AGENT_MODE", "react").lower()
+JSON_AGENT_MAX_STEPS = int(os.getenv("JSON_AGENT_MAX_STEPS", "8"))
+AGENT_TOOL_WORKERS = int(os.getenv("AGENT_TOOL_WORKERS", "8"))  # parallel tool calls within one JSON agent step
+
+# Multi-account requests: tools run once per account, concurrently
+FANOUT_WORKERS = int(os.getenv("FANOUT_WORKERS", "16"))
+
+# Multi-region scans ("region:all" in EC2/EKS/ECS tool input)
+AWS_SCAN_REGIONS = [r.strip() for r in os.getenv("AWS_SCAN_REGIONS", AWS_REGION).split(",") if r.strip()]
+REGION_SCAN_TIMEOUT_SECONDS = float(os.getenv("REGION_SCAN_TIMEOUT_SECONDS", "10"))
+REGION_SCAN_WORKERS = int(os.getenv("REGION_SCAN_WORKERS", "24"))
+REGION_SCAN_MAX_ATTEMPTS = int(os.getenv("REGION_SCAN_MAX_ATTEMPTS", "1"))  # botocore attempts per call in a scan
+AWS_CONNECT_TIMEOUT_SECONDS = int(os.getenv("AWS_CONNECT_TIMEOUT_SECONDS", "5"))
+AWS_READ_TIMEOUT_SECONDS = int(os.getenv("AWS_READ_TIMEOUT_SECONDS", "30"))
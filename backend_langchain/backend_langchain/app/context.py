@@ -1,3 +1,7 @@
 from contextvars import ContextVar
 
-current_account_id = ContextVar('current_account_id', default='default')
\ No newline at end of file
+current_account_id = ContextVar('current_account_id', default='default')
+# Set (2+ accounts) when one request targets several accounts; read by app.fanout
+current_account_ids = ContextVar('current_account_ids', default=None)
+# True inside a region-scan worker; app.aws_client then uses the short-timeout scan client config
+in_region_scan = ContextVar('in_region_scan', default=False)
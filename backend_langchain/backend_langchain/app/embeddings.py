@@ -0,0 +1,142 @@
+"""
+Query embedding service used by RAG and the answer cache.
+
+- An LRU cache keyed by normalised query text skips the model entirely
+  for repeated questions.
+- Concurrent cache misses are queued and encoded together by a single
+  worker thread, which waits up to EMBEDDING_BATCH_WAIT_MS to fill a
+  batch, so 50 concurrent users cost a few forward passes rather than 50.
+- EMBEDDING_QUANTIZE=int8 applies dynamic int8 quantisation to the
+  model's Linear layers for faster CPU inference.
+"""
+import logging
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(text: str) -> str:
+    # MiniLM's tokenizer is uncased, so lower-casing doesn't change the vector
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+class BatchingEmbeddings(Embeddings):
+    def __init__(self, model_name: str, cache_size: int, max_batch: int, wait_ms: float, quantize: str = ""):
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(model_name, device="cpu")
+        if quantize == "int8":
+            import torch
+
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            logger.info(f"Embedding model {model_name} quantised to int8")
+        self._model = model
+        self.quantize = quantize
+
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        self.max_batch = max_batch
+        self.wait = wait_ms / 1000
+        self._pending: queue.Queue = queue.Queue()
+
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=2000)
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.batched_queries = 0
+
+        threading.Thread(target=self._batch_worker, name="embedding-batcher", daemon=True).start()
+
+    # ── LangChain Embeddings interface ──
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        # Bulk ingestion path — already batched by the caller, nothing to cache
+        return self._model.encode(texts, batch_size=32).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        started = time.perf_counter()
+        key = normalize_query(text)
+
+        with self._cache_lock:
+            vec = self._cache.get(key)
+            if vec is not None:
+                self._cache.move_to_end(key)
+        hit = vec is not None
+
+        if not hit:
+            future = Future()
+            self._pending.put((key, future))
+            vec = future.result()
+            with self._cache_lock:
+                self._cache[key] = vec
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        self._record(started, hit)
+        return vec
+
+    # ── micro-batching ──
+    def _batch_worker(self):
+        while True:
+            batch = [self._pending.get()]
+            deadline = time.monotonic() + self.wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            texts = list(dict.fromkeys(key for key, _ in batch))
+            try:
+                vectors = dict(zip(texts, self._model.encode(texts, batch_size=len(texts)).tolist()))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            with self._stats_lock:
+                self.batches += 1
+                self.batched_queries += len(batch)
+            for key, future in batch:
+                future.set_result(vectors[key])
+
+    # ── stats ──
+    def _record(self, started: float, hit: bool):
+        with self._stats_lock:
+            self._latencies.append(time.perf_counter() - started)
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            lookups = self.hits + self.misses
+
+            def pct(p):
+                return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2) if latencies else None
+
+            return {
+                "quantize": self.quantize or "none",
+                "cache_size": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "batches": self.batches,
+                "avg_batch_size": round(self.batched_queries / self.batches, 2) if self.batches else 0.0,
+                "p50_ms": pct(0.50),
+                "p99_ms": pct(0.99),
+            }
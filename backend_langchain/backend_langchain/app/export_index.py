@@ -0,0 +1,91 @@
+"""
+Snapshot the `aws_docs` Chroma collection into a memory-mapped float32
+matrix plus a metadata file, which rag.py serves searches from in-process.
+
+Usage (re-run after every ingest):
+    docker exec -it cloud-agent-backend python -m app.export_index
+"""
+import json
+import os
+import time
+
+import chromadb
+import numpy as np
+
+from app.config import CHROMA_HOST, CHROMA_PORT, INDEX_SNAPSHOT_DIR
+from app.vector_index import read_current_version
+
+COLLECTION_NAME = "aws_docs"
+PAGE_SIZE = 1000
+KEEP_VERSIONS = 2  # the live snapshot plus one older, for readers mid-refresh
+
+
+def _cleanup(snapshot_dir: str, keep: list[str]):
+    for name in os.listdir(snapshot_dir):
+        if name.startswith(("vectors-", "meta-")):
+            version = name.split("-", 1)[1].rsplit(".", 1)[0]
+            if version not in keep:
+                os.remove(os.path.join(snapshot_dir, name))
+
+
+def export():
+    client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+    collection = client.get_collection(COLLECTION_NAME)
+    count = collection.count()
+    if not count:
+        print(f"Collection '{COLLECTION_NAME}' is empty — nothing to export.")
+        return
+
+    os.makedirs(INDEX_SNAPSHOT_DIR, exist_ok=True)
+    previous = read_current_version(INDEX_SNAPSHOT_DIR)
+    version = time.strftime("%Y%m%d%H%M%S")
+    vectors_path = os.path.join(INDEX_SNAPSHOT_DIR, f"vectors-{version}.npy")
+
+    ids, documents, metadatas = [], [], []
+    vectors = None
+    row = 0
+    for offset in range(0, count, PAGE_SIZE):
+        page = collection.get(
+            include=["embeddings", "documents", "metadatas"],
+            limit=PAGE_SIZE,
+            offset=offset,
+        )
+        batch = np.asarray(page["embeddings"], dtype=np.float32)
+        if not len(batch):
+            break
+        if vectors is None:
+            # Written straight into the memory-mapped file, never fully in RAM
+            vectors = np.lib.format.open_memmap(vectors_path, mode="w+", dtype=np.float32, shape=(count, batch.shape[1]))
+        norms = np.linalg.norm(batch, axis=1, keepdims=True)
+        vectors[row:row + len(batch)] = batch / np.where(norms == 0, 1.0, norms)
+        row += len(batch)
+
+        ids.extend(page["ids"])
+        documents.extend(page["documents"])
+        metadatas.extend(page["metadatas"])
+
+    if vectors is None:
+        # count() was non-zero but the collection was emptied before the first page
+        print(f"Collection '{COLLECTION_NAME}' returned no embeddings — nothing to export.")
+        return
+    vectors.flush()
+    if row != count:
+        # Collection changed under us; keep only the rows we actually read
+        del vectors
+        trimmed = np.load(vectors_path)[:row]
+        np.save(vectors_path, trimmed)
+
+    with open(os.path.join(INDEX_SNAPSHOT_DIR, f"meta-{version}.json"), "w", encoding="utf-8") as f:
+        json.dump({"ids": ids, "documents": documents, "metadatas": metadatas}, f)
+
+    current_tmp = os.path.join(INDEX_SNAPSHOT_DIR, "CURRENT.tmp")
+    with open(current_tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(current_tmp, os.path.join(INDEX_SNAPSHOT_DIR, "CURRENT"))
+
+    _cleanup(INDEX_SNAPSHOT_DIR, keep=[v for v in (version, previous) if v][:KEEP_VERSIONS])
+    print(f"✅ Exported {row} vectors to {INDEX_SNAPSHOT_DIR} (version {version}).")
+
+
+if __name__ == "__main__":
+    export()
@@ -0,0 +1,97 @@
+import re
+
+# Words that follow "pipeline" in a sentence but are never pipeline names
+_PIPELINE_STOPWORDS = {
+    "status", "state", "for", "of", "is", "named", "called", "the", "health",
+    "green", "red", "failing", "failed", "passing", "running", "healthy", "ok", "broken",
+}
+
+EC2_STATES = ("pending", "running", "shutting-down", "terminated", "stopping", "stopped")
+# Real instance type syntax (t3.micro, m5.2xlarge, u-6tb1.metal), so dotted
+# Name-tag fragments like "api.v2" or "web.prod" aren't read as types
+INSTANCE_TYPE_RE = re.compile(r"^[a-z][a-z0-9-]*\d[a-z0-9-]*\.(nano|micro|small|medium|large|\d*xlarge|metal[-\w]*)$")
+
+
+def looks_like_identifier(token: str) -> bool:
+    """Resource names carry a hyphen, digit or underscore; plain English words don't."""
+    return bool(re.search(r"[-_\d]", token))
+
+
+def extract_pipeline_name(text: str):
+    """
+    Extracts pipeline name from user input.
+    Examples: 'status of pipeline payments-prod', 'pipeline status for payments-prod',
+    'is the payments-prod pipeline green?'
+    Only identifier-like candidates count, so 'pipeline and ...' or 'the pipeline' give None.
+    """
+    patterns = (
+        r"pipeline\s+(?:(?:status|state)\s+)?(?:(?:of|for|named|called)\s+)?([a-zA-Z0-9-_]+)",
+        r"([a-zA-Z0-9-_]+)\s+pipeline\b",
+    )
+    for pattern in patterns:
+        for match in re.finditer(pattern, text):
+            name = match.group(1)
+            if name.lower() not in _PIPELINE_STOPWORDS and looks_like_identifier(name):
+                return name
+    return None
+
+
+_TOKEN_SPLIT_RE = re.compile(r"[\s,?!;()'\"]+")
+# Service names that contain digits but aren't resources
+_SERVICE_WORDS = {"s3", "ec2", "k8s", "route53", "elbv2"}
+
+
+def identifier_tokens(text: str) -> list[str]:
+    """Tokens that look like resource names or values: payments-prod, /dev/app/DB_HOST, t3.micro, db.example.com."""
+    tokens = []
+    for token in _TOKEN_SPLIT_RE.split(text):
+        token = token.strip(".:")
+        if token and re.search(r"[-_\d/.]", token) and token.lower() not in _SERVICE_WORDS:
+            tokens.append(token)
+    return tokens
+
+
+def extract_ssm_path(text: str):
+    """Extracts an SSM parameter path such as '/prod/payments/DB_HOST'."""
+    match = re.search(r"(/[a-zA-Z0-9_.\-/]+)", text)
+    return match.group(1).rstrip(".") if match else None
+
+
+def extract_eks_cluster_name(text: str):
+    """Extracts a cluster name from 'describe eks cluster payments-cluster'."""
+    match = re.search(r"cluster\s+([a-zA-Z0-9-_]+)", text)
+    if match and match.group(1).lower() not in {"status", "details", "info", "for", "of", "named", "called"}:
+        return match.group(1)
+    return None
+
+
+def extract_ecs_service(text: str):
+    """Extracts 'cluster/service' (or a bare 'service-name' after 'service')."""
+    match = re.search(r"([a-zA-Z0-9-_]+/[a-zA-Z0-9-_]+)", text)
+    if match:
+        return match.group(1)
+    match = re.search(r"service\s+([a-zA-Z0-9-_]+)", text)
+    if match and match.group(1).lower() not in {"status", "health", "for", "of", "named", "called"}:
+        return match.group(1)
+    return None
+
+
+def extract_ec2_filter(text: str) -> str:
+    """Keeps only the parts of an EC2 question describe_ec2_instances can filter on."""
+    tokens = []
+    for token in re.split(r"[\s,?]+", text.lower()):
+        if token in EC2_STATES or INSTANCE_TYPE_RE.match(token):
+            tokens.append(token)
+    return " ".join(tokens)
+
+
+REGION_RE = re.compile(r"\b(?:[a-z]{2}-(?:gov-)?[a-z]+-\d)\b")
+
+
+def extract_region_scope(text: str) -> str:
+    """'region:all' for 'all regions'-style questions, 'region:<r1>,<r2>' for named regions, else ''."""
+    q = text.lower()
+    if re.search(r"\b(all|every|each|any|multiple)\s+(the\s+)?regions?\b|\bacross\s+(all\s+)?(the\s+)?regions?\b", q):
+        return "region:all"
+    named = list(dict.fromkeys(REGION_RE.findall(q)))
+    return f"region:{','.join(named)}" if named else ""
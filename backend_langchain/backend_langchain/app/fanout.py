@@ -0,0 +1,55 @@
+"""
+Multi-account fan-out for read-only tools.
+
+When a request targets several accounts (`current_account_ids`), a
+fan-out tool runs once per account at the same time — each run in a copy
+of the request context with `current_account_id` set to that account, so
+STS credentials, pooled clients and tool caches are all per account — and
+the outputs are merged with every line labelled by its account. A
+cross-account check takes as long as the slowest account.
+"""
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import FANOUT_WORKERS
+from app.context import current_account_id, current_account_ids
+
+_pool = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="fanout")
+
+
+def _in_account(account_id: str, fn, *args, **kwargs):
+    current_account_id.set(account_id)
+    current_account_ids.set(None)
+    return fn(*args, **kwargs)
+
+
+def merge_outputs(results: list[tuple[str, str]]) -> str:
+    """Label every non-empty line with its account: '[prod] ...'."""
+    lines = []
+    for account_id, output in results:
+        lines.extend(f"[{account_id}] {line}" for line in str(output).splitlines() if line.strip())
+    return "\n".join(lines)
+
+
+def fan_out(fn):
+    """Run the tool once per account in current_account_ids and merge the results. Goes *under* @tool."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        accounts = current_account_ids.get()
+        if not accounts:
+            return fn(*args, **kwargs)
+        futures = [
+            (a, _pool.submit(contextvars.copy_context().run, _in_account, a, fn, *args, **kwargs))
+            for a in accounts
+        ]
+        results = []
+        for account_id, future in futures:
+            try:
+                results.append((account_id, future.result()))
+            except Exception as e:
+                results.append((account_id, f"Error: {e}"))
+        return merge_outputs(results)
+
+    return wrapper
@@ -0,0 +1,185 @@
+"""
+Deterministic fast path in front of the ReAct agent.
+
+Simple, unambiguous requests ("list s3 buckets", "status of pipeline
+payments-prod") are matched by keyword rules and answered by calling the
+tool directly — no LLM round trip. Anything a rule can't handle confidently
+returns None and goes to the agent. Only read-only tools are routed here.
+"""
+import re
+import threading
+
+from app.extractors import (
+    EC2_STATES,
+    INSTANCE_TYPE_RE,
+    REGION_RE,
+    extract_ec2_filter,
+    extract_ecs_service,
+    extract_eks_cluster_name,
+    extract_pipeline_name,
+    extract_region_scope,
+    extract_ssm_path,
+    identifier_tokens,
+)
+from app.services.aws_tools import (
+    describe_ec2_instances,
+    describe_eks_cluster,
+    get_ecs_service_status,
+    list_eks_clusters,
+    list_s3_buckets,
+)
+from app.services.codepipeline_tools import get_all_pipeline_statuses, get_pipeline_status, list_pipelines
+from app.services.ssm_tools import get_ssm_parameter, list_ssm_parameters
+
+# Questions that need reasoning or docs, not a single lookup — and anything that acts
+_NEEDS_AGENT = re.compile(
+    r"\b(why|how|who|explain|should|compare|owner|owns|runbook|docs?|and then|update|set|change"
+    r"|roll ?back|revert|deploy|redeploy|release|promote|restart|reboot|start|stop|terminate|kill|delete"
+    r"|remove|destroy|create|scale|trigger|retry|rerun|approve|cancel|put|write)\b"
+)
+# Several things at once, or "everything but X" — a single tool call would answer something else
+_COMPOUND = re.compile(r"\b(and|or|vs|versus|not|except|excluding|but|without|other than)\b|n't\b")
+_LISTING = re.compile(r"\b(list|show|all|available|what|which|get)\b")
+_MAX_WORDS = 14
+# "instances" of other services; those questions are not about EC2
+_OTHER_INSTANCES = re.compile(
+    r"\b(rds|db|dbs|database|aurora|docdb|neptune|redshift|elasticache|cache|opensearch|elasticsearch"
+    r"|sagemaker|notebook|emr|lightsail|workspaces?)\b"
+)
+# A specific bucket ("bucket foo", "foo bucket", "s3://foo") or a question about bucket details
+_S3_SPECIFIC = re.compile(
+    r"s3://|\bbucket\s+[a-z0-9][a-z0-9.-]+"
+    r"|\b(?!(?:s3|the|a|my|our|which|each|every|any|all|that|this)\b)[a-z0-9][a-z0-9.-]+\s+bucket\b"
+    r"|\b(versioning|version|polic(y|ies)|encrypt\w*|lifecycle|public|acl|cors|logging|replication"
+    r"|size|objects?|files?|contents?|tags?)\b"
+)
+
+# EC2 qualifiers extract_ec2_filter can't turn into a filter; dropping them would widen the answer
+_EC2_QUALIFIERS = re.compile(r"\b(named|name|called|tagged|tags?|labell?ed|for|with|owned|belonging|team)\b")
+
+_lock = threading.Lock()
+_stats = {"fast": 0, "agent": 0, "rules": {}}
+
+
+def _entities(query: str) -> list[str]:
+    """Named resources in the query; instance types and regions are filters, not entities."""
+    return [
+        t for t in identifier_tokens(query)
+        if not INSTANCE_TYPE_RE.match(t.lower()) and not REGION_RE.fullmatch(t.lower()) and t.lower() not in EC2_STATES
+    ]
+
+
+def _region_scope(q: str):
+    """extract_region_scope, or None when regions are mentioned in a way it can't parse."""
+    scope = extract_region_scope(q)
+    if not scope and re.search(r"\bregions?\b", q):
+        return None
+    return scope
+
+
+def _match(query: str):
+    """Return (tool, tool_input) for the first matching rule, or None."""
+    q = query.lower().strip()
+    if len(q.split()) > _MAX_WORDS or _NEEDS_AGENT.search(q) or _COMPOUND.search(q):
+        return None
+    if len(set(_entities(query))) > 1:
+        return None
+
+    # ---------- CodePipeline ----------
+    if "pipeline" in q:
+        if re.search(r"\b(all|every|which|any)\b.*pipelines?", q) and re.search(r"status|fail|green|red|broken|running|progress", q):
+            return get_all_pipeline_statuses, ""
+        name = extract_pipeline_name(query)
+        if name and re.search(r"status|state|green|red|fail|pass|succeed|running|latest|commit|branch", q):
+            return get_pipeline_status, name
+        if "pipelines" in q and _LISTING.search(q):
+            return list_pipelines, ""
+        return None
+
+    # ---------- S3 ----------
+    # Only "which buckets are there" — anything about one bucket or its settings needs the agent
+    if re.search(r"\b(s3|buckets?)\b", q):
+        if _LISTING.search(q) and not _S3_SPECIFIC.search(q):
+            return list_s3_buckets, ""
+        return None
+
+    # ---------- EKS ----------
+    if "eks" in q or "kubernetes" in q:
+        name = extract_eks_cluster_name(query)
+        if name:
+            return describe_eks_cluster, name
+        scope = _region_scope(q)
+        if "clusters" in q and _LISTING.search(q) and scope is not None:
+            return list_eks_clusters, scope
+        return None
+
+    # ---------- ECS ----------
+    if "ecs" in q:
+        service, scope = extract_ecs_service(query), _region_scope(q)
+        return (get_ecs_service_status, f"{service} {scope}".strip()) if service and scope is not None else None
+
+    # ---------- SSM ----------
+    if re.search(r"\b(ssm|parameters?|env|environment variables?)\b", q):
+        path = extract_ssm_path(query)
+        if not path:
+            return None
+        if re.search(r"\b(list|all|under)\b", q) or "parameters" in q:
+            return list_ssm_parameters, path
+        return get_ssm_parameter, path
+
+    # ---------- EC2 ----------
+    is_ec2 = "ec2" in q or ("instances" in q and not _OTHER_INSTANCES.search(q))
+    if is_ec2 and _LISTING.search(q):
+        # Names, tags and "for <team>" can't be filtered here — let the agent work them out
+        if _EC2_QUALIFIERS.search(q) or _entities(query):
+            return None
+        scope = _region_scope(q)
+        if scope is None:
+            return None
+        return describe_ec2_instances, f"{extract_ec2_filter(q)} {scope}".strip()
+
+    return None
+
+
+def try_fast_path(query: str):
+    """Answer the query directly from a tool if a rule matches; returns (tool_name, output) or None."""
+    match = _match(query)
+    if match is None:
+        record_path("agent")
+        return None
+
+    tool, tool_input = match
+    output = tool.invoke(tool_input)
+    record_path("fast", tool.name)
+    return tool.name, output
+
+
+async def atry_fast_path(query: str):
+    """Async variant of try_fast_path; the tool's blocking AWS call runs in a worker thread."""
+    match = _match(query)
+    if match is None:
+        record_path("agent")
+        return None
+
+    tool, tool_input = match
+    output = await tool.ainvoke(tool_input)
+    record_path("fast", tool.name)
+    return tool.name, output
+
+
+def record_path(path: str, rule: str | None = None):
+    with _lock:
+        _stats[path] += 1
+        if rule:
+            _stats["rules"][rule] = _stats["rules"].get(rule, 0) + 1
+
+
+def get_fast_path_stats() -> dict:
+    with _lock:
+        total = _stats["fast"] + _stats["agent"]
+        return {
+            "fast": _stats["fast"],
+            "agent": _stats["agent"],
+            "hit_rate": round(_stats["fast"] / total, 3) if total else 0.0,
+            "rules": dict(_stats["rules"]),
+        }
@@ -4,22 +4,105 @@ documentation into ChromaDB.
 
 Usage:
     docker exec -it cloud-agent-backend python -m app.ingest_aws_docs
+    docker exec -it cloud-agent-backend python -m app.ingest_aws_docs --full   # rebuild from scratch
 
 Add any .md, .txt files to the ./docs/ folder and re-run.
+
+Ingestion is incremental: chunk IDs are derived from the file path and
+chunk content, and a local manifest records what is already indexed.
+Unchanged files are skipped, only new chunks are embedded and upserted,
+chunks kept from an edited file get their metadata (start_index)
+refreshed, and chunks from edited or deleted files are removed. A
+collection built without a manifest has to be rebuilt once with --full.
 """
 
+import argparse
+import hashlib
+import json
 import os
+from collections import Counter
+
 import chromadb
 from langchain_community.vectorstores import Chroma
 from langchain_community.embeddings import SentenceTransformerEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import DirectoryLoader, TextLoader
+from langchain_core.documents import Document
+
+from app.config import CHROMA_HOST, CHROMA_PORT
 
 DOCS_DIR = os.getenv("DOCS_DIR", "./docs")
-CHROMA_HOST = "chroma"
-CHROMA_PORT = 8000
+MANIFEST_PATH = os.getenv("INGEST_MANIFEST", os.path.join(DOCS_DIR, ".ingest_manifest.json"))
+COLLECTION_NAME = "aws_docs"
+UPSERT_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "256"))
+MANIFEST_SAVE_EVERY = 100  # changed files between manifest checkpoints
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _load_manifest() -> dict:
+    if not os.path.exists(MANIFEST_PATH):
+        return {"files": {}}
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest: dict):
+    tmp = MANIFEST_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def _scan_docs() -> list[str]:
+    paths = []
+    for root, _, files in os.walk(DOCS_DIR):
+        for name in files:
+            if name.endswith(".md"):
+                paths.append(os.path.relpath(os.path.join(root, name), DOCS_DIR))
+    return sorted(paths)
+
+
+def _chunk_ids(rel_path: str, chunks: list[Document]) -> list[str]:
+    """Deterministic IDs: path + chunk content hash (+ occurrence, for repeated text)."""
+    seen = Counter()
+    ids = []
+    for chunk in chunks:
+        digest = _sha256(chunk.page_content)[:16]
+        seen[digest] += 1
+        ids.append(f"{rel_path}:{digest}:{seen[digest]}")
+    return ids
+
+
+def _upsert(vectorstore, chunks: list[Document], ids: list[str]):
+    for i in range(0, len(chunks), UPSERT_BATCH_SIZE):
+        batch = chunks[i:i + UPSERT_BATCH_SIZE]
+        vectorstore.add_texts(
+            texts=[c.page_content for c in batch],
+            metadatas=[c.metadata for c in batch],
+            ids=ids[i:i + UPSERT_BATCH_SIZE],
+        )
+
+
+def _update_metadata(chroma_client, chunks: list[Document], ids: list[str]):
+    """Refresh metadata of already-embedded chunks without re-embedding them."""
+    collection = chroma_client.get_collection(COLLECTION_NAME)
+    for i in range(0, len(chunks), UPSERT_BATCH_SIZE):
+        collection.update(
+            ids=ids[i:i + UPSERT_BATCH_SIZE],
+            metadatas=[c.metadata for c in chunks[i:i + UPSERT_BATCH_SIZE]],
+        )
 
-def ingest():
+
+def _collection_count(chroma_client) -> int:
+    try:
+        return chroma_client.get_collection(COLLECTION_NAME).count()
+    except Exception:
+        return 0  # no collection yet
+
+
+def ingest(full: bool = False):
     print(f"Loading docs from: {DOCS_DIR}")
 
     if not os.path.exists(DOCS_DIR):
@@ -28,30 +111,89 @@ def ingest():
         print("Add your .md or .txt runbooks/docs to ./docs/ and re-run.")
         return
 
-    loader = DirectoryLoader(DOCS_DIR, glob="**/*.md", loader_cls=TextLoader)
-    documents = loader.load()
+    chroma_client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+    if full:
+        print("Full rebuild requested — dropping collection and manifest.")
+        try:
+            chroma_client.delete_collection(COLLECTION_NAME)
+        except Exception:
+            pass
+        if os.path.exists(MANIFEST_PATH):
+            os.remove(MANIFEST_PATH)
 
-    if not documents:
+    paths = _scan_docs()
+    if not paths:
         print("No documents found. Add .md files to ./docs/")
-        return
 
-    print(f"Loaded {len(documents)} documents. Splitting into chunks...")
+    if not full and not os.path.exists(MANIFEST_PATH) and _collection_count(chroma_client) > 0:
+        # Built before incremental ingestion (random IDs): adding would duplicate every chunk
+        print(
+            f"'{COLLECTION_NAME}' already has documents but there is no manifest at {MANIFEST_PATH}. "
+            f"Re-run with --full to rebuild it."
+        )
+        return
 
-    splitter = RecursiveCharacterTextSplitter(chunk_size=800, chunk_overlap=100)
-    chunks = splitter.split_documents(documents)
-    print(f"Created {len(chunks)} chunks.")
+    manifest = _load_manifest()
+    indexed = manifest["files"]
 
     embedding_fn = SentenceTransformerEmbeddings(model_name="all-MiniLM-L6-v2")
-    chroma_client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
-
     vectorstore = Chroma(
         client=chroma_client,
-        collection_name="aws_docs",
+        collection_name=COLLECTION_NAME,
         embedding_function=embedding_fn,
     )
+    splitter = RecursiveCharacterTextSplitter(chunk_size=800, chunk_overlap=100, add_start_index=True)
+
+    changed = unchanged = added_chunks = removed_chunks = 0
+    for rel_path in paths:
+        with open(os.path.join(DOCS_DIR, rel_path), encoding="utf-8") as f:
+            text = f.read()
+        file_hash = _sha256(text)
+
+        previous = indexed.get(rel_path)
+        if previous and previous["sha256"] == file_hash:
+            unchanged += 1
+            continue
+
+        chunks = splitter.split_documents([Document(page_content=text, metadata={"source": rel_path})])
+        ids = _chunk_ids(rel_path, chunks)
+        old_ids = set(previous["chunk_ids"]) if previous else set()
+
+        new = [(c, i) for c, i in zip(chunks, ids) if i not in old_ids]
+        kept = [(c, i) for c, i in zip(chunks, ids) if i in old_ids]
+        stale = list(old_ids - set(ids))
+        if new:
+            _upsert(vectorstore, [c for c, _ in new], [i for _, i in new])
+        if kept:
+            # Same text, but start_index may have moved; context_budget merges on it
+            _update_metadata(chroma_client, [c for c, _ in kept], [i for _, i in kept])
+        if stale:
+            vectorstore.delete(ids=stale)
+
+        indexed[rel_path] = {"sha256": file_hash, "chunk_ids": ids}
+        changed += 1
+        added_chunks += len(new)
+        removed_chunks += len(stale)
+        if changed % MANIFEST_SAVE_EVERY == 0:
+            _save_manifest(manifest)
+
+    # Files that disappeared since the last run
+    present = set(paths)
+    deleted = [p for p in indexed if p not in present]
+    for rel_path in deleted:
+        stale = indexed.pop(rel_path)["chunk_ids"]
+        if stale:
+            vectorstore.delete(ids=stale)
+        removed_chunks += len(stale)
+
+    _save_manifest(manifest)
+    print(
+        f"✅ Done. {changed} changed, {unchanged} unchanged, {len(deleted)} deleted files; "
+        f"{added_chunks} chunks embedded, {removed_chunks} chunks removed from '{COLLECTION_NAME}'."
+    )
 
-    vectorstore.add_documents(chunks)
-    print(f"✅ Done. {len(chunks)} chunks ingested into ChromaDB collection 'aws_docs'.")
 
 if __name__ == "__main__":
-    ingest()
+    parser = argparse.ArgumentParser(description="Incrementally ingest ./docs into ChromaDB.")
+    parser.add_argument("--full", action="store_true", help="drop the collection and re-embed everything")
+    ingest(full=parser.parse_args().full)
@@ -0,0 +1,299 @@
+"""
+JSON agent loop (AGENT_MODE=json).
+
+Instead of parsing free-text ReAct ("Action: / Action Input: / Final Answer:"),
+the model is run with Ollama's JSON-constrained output and each reply is
+validated against a small schema: either a tool call or a final answer.
+Replies that don't validate are repaired locally (code fences, stray text
+around the object, trailing commas, near-miss tool names) rather than
+spending another LLM round trip on a "please fix your format" turn. Only
+a reply that can't be repaired gets an "invalid reply" observation and
+another try; raw model output is never returned as the answer.
+
+A step may also carry a list of independent tool calls; they run
+concurrently in a thread pool (each worker gets a copy of the request's
+context, so `current_account_id` is preserved) and all observations go
+back to the model together — a question about N pipelines costs one LLM
+hop instead of N.
+"""
+import asyncio
+import contextvars
+import difflib
+import json
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.agents import AgentAction
+from pydantic import BaseModel, ValidationError
+
+from app.config import AGENT_TOOL_WORKERS, JSON_AGENT_MAX_STEPS
+from app.llm import get_json_llm
+
+logger = logging.getLogger(__name__)
+
+PROMPT = """You are a helpful DevOps assistant for an engineering team.
+You help developers check deployment status, pipeline status, environment variables,
+and answer questions about the AWS infrastructure.
+
+You have access to the following tools:
+{tools}
+
+Rules:
+- Always use a tool to get live data rather than guessing
+- For internal docs, runbooks or service ownership use rag_search
+- NEVER apply production changes without showing the approval message
+- The final answer must be clear and human-friendly — not raw JSON
+
+Reply with exactly one JSON object and nothing else, in one of these shapes:
+{{"thought": "...", "tool": "<one of: {tool_names}>", "tool_input": "<input string>"}}
+{{"thought": "...", "tool_calls": [{{"tool": "...", "tool_input": "..."}}, {{"tool": "...", "tool_input": "..."}}]}}
+{{"thought": "...", "final_answer": "<answer for the user>"}}
+Use "tool_calls" to run several independent lookups at once (e.g. the status of three pipelines).
+
+Previous conversation with this user (empty if none):
+{chat_history}
+
+Question: {input}
+{scratchpad}"""
+
+
+class ToolCall(BaseModel):
+    tool: str
+    tool_input: str = ""
+
+
+class AgentStep(BaseModel):
+    thought: str = ""
+    tool: str | None = None
+    tool_input: str = ""
+    tool_calls: list[ToolCall] = []
+    final_answer: str | None = None
+
+    def calls(self) -> list[ToolCall]:
+        if self.tool_calls:
+            return self.tool_calls
+        return [ToolCall(tool=self.tool, tool_input=self.tool_input)] if self.tool else []
+
+
+class StepParseError(Exception):
+    pass
+
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.I)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+def _load_object(text: str) -> dict:
+    """json.loads with local fixes for the usual small-model slips."""
+    text = _FENCE_RE.sub("", text.strip())
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        raise StepParseError(f"no JSON object in reply: {text[:120]!r}")
+    text = text[start:end + 1]
+    for candidate in (text, _TRAILING_COMMA_RE.sub(r"\1", text)):
+        try:
+            data = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict):
+            return data
+    raise StepParseError(f"unparseable JSON: {text[:120]!r}")
+
+
+def _coerce_input(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict) and len(value) == 1:
+        return _coerce_input(next(iter(value.values())))
+    return json.dumps(value)
+
+
+def _match_tool(name: str, tool_names: list[str]) -> str:
+    if name in tool_names:
+        return name
+    close = difflib.get_close_matches(name.strip().lower(), tool_names, n=1, cutoff=0.6)
+    if not close:
+        raise StepParseError(f"unknown tool {name!r}")
+    return close[0]
+
+
+def _normalise_call(data: dict) -> bool:
+    """Fix key aliases and non-string inputs in place; True if anything changed."""
+    repaired = False
+    # Common aliases for the schema keys
+    for alias, key in (("action", "tool"), ("name", "tool"), ("action_input", "tool_input"), ("input", "tool_input"), ("answer", "final_answer")):
+        if alias in data and key not in data:
+            data[key] = data.pop(alias)
+            repaired = True
+    if "tool_input" in data and not isinstance(data["tool_input"], str):
+        data["tool_input"] = _coerce_input(data["tool_input"])
+        repaired = True
+    return repaired
+
+
+def parse_step(text: str, tool_names: list[str]) -> tuple[AgentStep, bool]:
+    """Validate a model reply as an AgentStep; returns (step, repaired)."""
+    data = _load_object(text)
+    repaired = _normalise_call(data)
+    for alias in ("actions", "calls"):
+        if isinstance(data.get(alias), list) and "tool_calls" not in data:
+            data["tool_calls"] = data.pop(alias)
+            repaired = True
+    if isinstance(data.get("tool_calls"), list):
+        data["tool_calls"] = [c for c in data["tool_calls"] if isinstance(c, dict)]
+        for call in data["tool_calls"]:
+            repaired = _normalise_call(call) or repaired
+    if isinstance(data.get("final_answer"), (dict, list)):
+        data["final_answer"] = json.dumps(data["final_answer"])
+        repaired = True
+    try:
+        step = AgentStep(**data)
+    except ValidationError as e:
+        raise StepParseError(str(e))
+    if step.final_answer is None:
+        if not step.calls():
+            raise StepParseError("reply has neither a tool nor a final_answer")
+        for call in step.calls():
+            tool = _match_tool(call.tool, tool_names)
+            repaired = repaired or tool != call.tool
+            call.tool = tool
+    return step, repaired
+
+
+def _announce(config: dict, step: AgentStep):
+    # Same hook the ReAct executor fires, so streaming and escalation callbacks see each call
+    for i, call in enumerate(step.calls()):
+        action = AgentAction(call.tool, call.tool_input, f"{step.thought if i == 0 else ''}\nAction: {call.tool}")
+        for handler in config.get("callbacks") or []:
+            handler.on_agent_action(action)
+
+
+_tool_pool = ThreadPoolExecutor(max_workers=AGENT_TOOL_WORKERS, thread_name_prefix="agent-tool")
+
+
+class JsonAgent:
+    """
+    Drop-in for AgentExecutor.invoke/ainvoke: takes {"input", "chat_history"}
+    and returns {"output"}. The prompt lists `prompt_tools`; any tool in
+    `tools` can be run.
+    """
+
+    def __init__(self, prompt_tools: list, tools: list, max_steps: int = JSON_AGENT_MAX_STEPS):
+        self.tools = {t.name: t for t in tools}
+        self.tool_names = list(self.tools)
+        self.max_steps = max_steps
+        self._tool_block = "\n".join(f"{t.name}: {t.description}" for t in prompt_tools)
+        self._prompt_names = ", ".join(t.name for t in prompt_tools)
+
+    def _prompt(self, inputs: dict, scratchpad: list[str]) -> str:
+        return PROMPT.format(
+            tools=self._tool_block,
+            tool_names=self._prompt_names,
+            chat_history=inputs.get("chat_history", ""),
+            input=inputs["input"],
+            scratchpad="\n".join(scratchpad),
+        )
+
+    def _next(self, reply: str, scratchpad: list[str]):
+        """
+        Parse one reply; returns (final answer, None), (None, tool step to run),
+        or (None, None) when the reply was unusable and the model should retry.
+        """
+        try:
+            step, repaired = parse_step(reply, self.tool_names)
+        except StepParseError as e:
+            json_agent_stats.record("unrepairable")
+            logger.warning(f"JSON agent reply could not be repaired: {e}")
+            # Never show the raw reply to the user; tell the model what was wrong and let it retry
+            scratchpad.append(reply.strip()[:500])
+            scratchpad.append(
+                f"Observation: invalid reply: {e}; reply with one JSON object using one of: {self._prompt_names}"
+            )
+            return None, None
+        json_agent_stats.record("repaired" if repaired else "valid")
+        if step.final_answer is not None:
+            return step.final_answer, None
+        calls = [{"tool": c.tool, "tool_input": c.tool_input} for c in step.calls()]
+        scratchpad.append(json.dumps({"thought": step.thought, "tool_calls": calls}))
+        return None, step
+
+    def _run_calls(self, calls: list[ToolCall], config: dict) -> str:
+        """Run the step's tool calls (concurrently when there are several); one combined observation."""
+        if len(calls) == 1:
+            return f"Observation: {self.tools[calls[0].tool].invoke(calls[0].tool_input, config=config)}"
+        futures = [
+            _tool_pool.submit(contextvars.copy_context().run, self.tools[c.tool].invoke, c.tool_input, config=config)
+            for c in calls
+        ]
+        parts = []
+        for call, future in zip(calls, futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = f"Error running {call.tool}: {e}"
+            parts.append(f"Observation [{call.tool}({call.tool_input})]: {result}")
+        return "\n".join(parts)
+
+    @staticmethod
+    def _give_up(last_step, scratchpad: list[str]) -> str:
+        """Out of steps: say why, plus whatever the tools returned so the work isn't lost."""
+        message = "I was unable to process that request." if last_step is None else "Agent stopped due to iteration limit."
+        observations = [
+            entry for entry in scratchpad
+            if entry.startswith("Observation") and not entry.startswith("Observation: invalid reply")
+        ]
+        if not observations:
+            return message
+        return f"{message} Tool results so far:\n" + "\n".join(o[:1000] for o in observations)
+
+    def invoke(self, inputs: dict, config: dict | None = None) -> dict:
+        config = config or {}
+        scratchpad = []
+        step = None
+        for _ in range(self.max_steps):
+            reply = get_json_llm().invoke(self._prompt(inputs, scratchpad), config=config)
+            answer, step = self._next(reply, scratchpad)
+            if answer is not None:
+                return {"output": answer}
+            if step is None:
+                continue
+            _announce(config, step)
+            scratchpad.append(self._run_calls(step.calls(), config))
+        return {"output": self._give_up(step, scratchpad)}
+
+    async def ainvoke(self, inputs: dict, config: dict | None = None) -> dict:
+        config = config or {}
+        scratchpad = []
+        step = None
+        for _ in range(self.max_steps):
+            reply = await get_json_llm().ainvoke(self._prompt(inputs, scratchpad), config=config)
+            answer, step = self._next(reply, scratchpad)
+            if answer is not None:
+                return {"output": answer}
+            if step is None:
+                continue
+            _announce(config, step)
+            # to_thread copies the context too, so the pool workers inherit the account
+            scratchpad.append(await asyncio.to_thread(self._run_calls, step.calls(), config))
+        return {"output": self._give_up(step, scratchpad)}
+
+
+class _ParseStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {"valid": 0, "repaired": 0, "unrepairable": 0}
+
+    def record(self, outcome: str):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counts)
+
+
+json_agent_stats = _ParseStats()
@@ -0,0 +1,95 @@
+"""
+Lazy, thread-safe construction of heavy components (embedding model,
+Chroma client, LLM, agent) plus a background warmup that loads them
+ahead of the first request. Component state backs /healthz and /readyz.
+"""
+import logging
+import threading
+import time
+
+from app.config import WARMUP_MAX_ATTEMPTS, WARMUP_RETRY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_components: dict[str, "LazyComponent"] = {}
+
+
+class LazyComponent:
+    """
+    Builds its value on first get(); failures are recorded and retried on the next get().
+    `optional_when()` returning True means readiness doesn't wait for this component.
+    """
+
+    def __init__(self, name: str, factory, optional_when=None):
+        self.name = name
+        self._factory = factory
+        self._optional_when = optional_when
+        self._value = None
+        self._lock = threading.Lock()
+        self.state = "pending"
+        self.error = None
+        self.load_seconds = None
+        _components[name] = self
+
+    def get(self):
+        if self.state == "ready":
+            return self._value
+        with self._lock:
+            if self.state == "ready":
+                return self._value
+            self.state = "loading"
+            started = time.perf_counter()
+            try:
+                value = self._factory()
+            except Exception as e:
+                self.state = "error"
+                self.error = str(e)
+                logger.warning(f"Failed to initialise {self.name}: {e}")
+                raise
+            self._value = value
+            self.error = None
+            self.load_seconds = round(time.perf_counter() - started, 3)
+            self.state = "ready"
+            logger.info(f"Initialised {self.name} in {self.load_seconds}s")
+            return value
+
+    def required(self) -> bool:
+        return self._optional_when is None or not self._optional_when()
+
+    def status(self) -> dict:
+        return {"state": self.state, "load_seconds": self.load_seconds, "error": self.error, "required": self.required()}
+
+
+def component_status() -> dict:
+    return {name: c.status() for name, c in _components.items()}
+
+
+def is_ready() -> bool:
+    return all(c.state == "ready" or not c.required() for c in _components.values())
+
+
+def _warmup():
+    started = time.perf_counter()
+    for attempt in range(1, WARMUP_MAX_ATTEMPTS + 1):
+        pending = [c for c in _components.values() if c.state != "ready"]
+        if not pending:
+            break
+        for component in pending:
+            try:
+                component.get()
+            except Exception:
+                pass
+        if not is_ready():
+            logger.info(f"Warmup attempt {attempt} incomplete, retrying in {WARMUP_RETRY_SECONDS}s")
+            time.sleep(WARMUP_RETRY_SECONDS)
+
+    elapsed = round(time.perf_counter() - started, 3)
+    if is_ready():
+        logger.info(f"Warmup finished in {elapsed}s")
+    else:
+        logger.warning(f"Warmup gave up after {elapsed}s: {component_status()}")
+
+
+def start_warmup():
+    """Load every registered component in a background thread."""
+    threading.Thread(target=_warmup, name="warmup", daemon=True).start()
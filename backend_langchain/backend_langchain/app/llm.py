@@ -1,12 +1,56 @@
-from langchain_ollama import OllamaLLM
 import os
+import requests
+from app.config import OLLAMA_KEEP_ALIVE
+from app.lifecycle import LazyComponent
 
 LLM_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://llm:11434")
 MODEL_NAME = os.getenv("OLLAMA_MODEL", "mistral")
 
-# Single shared LLM instance
-llm = OllamaLLM(
-    base_url=LLM_BASE_URL,
-    model=MODEL_NAME,
-    temperature=0,        # deterministic — important for tool selection
-)
+
+def _build_llm():
+    from langchain_ollama import OllamaLLM
+
+    # Single shared LLM instance
+    return OllamaLLM(
+        base_url=LLM_BASE_URL,
+        model=MODEL_NAME,
+        temperature=0,        # deterministic — important for tool selection
+        keep_alive=OLLAMA_KEEP_ALIVE,
+    )
+
+
+def _build_json_llm():
+    from langchain_ollama import OllamaLLM
+
+    # Same model, output constrained to valid JSON (AGENT_MODE=json)
+    return OllamaLLM(
+        base_url=LLM_BASE_URL,
+        model=MODEL_NAME,
+        temperature=0,
+        keep_alive=OLLAMA_KEEP_ALIVE,
+        format="json",
+    )
+
+
+def _load_model():
+    """Tiny generate so Ollama loads the model into memory before the first user request."""
+    resp = requests.post(
+        f"{LLM_BASE_URL}/api/generate",
+        json={"model": MODEL_NAME, "prompt": "", "stream": False, "keep_alive": OLLAMA_KEEP_ALIVE},
+        timeout=(5, 600),
+    )
+    resp.raise_for_status()
+    return True
+
+
+_llm = LazyComponent("llm", _build_llm)
+_json_llm = LazyComponent("llm_json", _build_json_llm)
+_model = LazyComponent("ollama_model", _load_model)
+
+
+def get_llm():
+    return _llm.get()
+
+
+def get_json_llm():
+    return _json_llm.get()
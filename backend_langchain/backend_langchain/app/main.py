@@ -1,4 +1,12 @@
-from fastapi import FastAPI
+import time
+
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from app.config import WARMUP_ENABLED
+from app.lifecycle import component_status, is_ready, start_warmup
+from app.metrics import HTTP_SECONDS, render_metrics
 from app.routers import tools
 from fastapi.middleware.cors import CORSMiddleware
 import logging
@@ -6,6 +14,7 @@ import logging
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+logger.info(f"App modules imported in {time.perf_counter() - _import_started:.3f}s")
 
 app = FastAPI(title="Cloud Agent Controller")
 
@@ -18,9 +27,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    # For streaming responses this is time to first byte, not the whole stream
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    HTTP_SECONDS.labels(request.method, route, str(response.status_code)).observe(time.perf_counter() - started)
+    return response
+
+
 # Include routers
 app.include_router(tools.router, prefix="/api", tags=["tools"])
 
 @app.get("/")
-def root():
-    return {"message": "Cloud Agent Controller is running!"}
\ No newline at end of file
+async def root():
+    # async so health checks never wait behind agent runs for a threadpool thread
+    return {"message": "Cloud Agent Controller is running!"}
+
+
+@app.on_event("startup")
+async def warmup():
+    # Load the embedding model, Chroma client and Mistral in the background
+    if WARMUP_ENABLED:
+        start_warmup()
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness — the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness — every heavy component has been initialised."""
+    body = {"ready": is_ready(), "components": component_status()}
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint."""
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
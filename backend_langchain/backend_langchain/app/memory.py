@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+from app.config import (
+    MEMORY_IDLE_TTL_SECONDS,
+    MEMORY_MAX_SESSIONS,
+    MEMORY_MAX_TURNS,
+    MEMORY_TOKEN_BUDGET,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting Mistral prompts
+    return len(text) // 4 + 1
+
+
+class SessionMemoryStore:
+    """
+    Conversation history per session. Bounded three ways: number of
+    sessions (least recently used are evicted, idle ones expire), turns
+    per session, and an approximate token budget per session so the
+    rendered history never grows the prompt past a fixed size.
+    """
+
+    def __init__(self, max_sessions: int, max_turns: int, token_budget: int, idle_ttl: float):
+        self.max_sessions = max_sessions
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.idle_ttl = idle_ttl
+        self._sessions: OrderedDict = OrderedDict()  # key -> [deque of (human, ai, tokens), last_used]
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _evict(self, now: float):
+        while self._sessions:
+            key, (_, last_used) = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - last_used < self.idle_ttl:
+                break
+            del self._sessions[key]
+            self.evictions += 1
+
+    def history(self, key) -> str:
+        """Rendered history for the prompt ("" for new or anonymous sessions)."""
+        if key is None:
+            return ""
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                return ""
+            entry[1] = time.monotonic()
+            self._sessions.move_to_end(key)
+            return "\n".join(f"User: {h}\nAssistant: {a}" for h, a, _ in entry[0])
+
+    def has_history(self, key) -> bool:
+        with self._lock:
+            return key is not None and key in self._sessions
+
+    def append(self, key, human: str, ai: str):
+        if key is None:
+            return
+        # A single oversized answer is clipped rather than wiping the session
+        max_chars = self.token_budget * 4 // 2
+        if len(ai) > max_chars:
+            ai = ai[:max_chars] + " …"
+        tokens = estimate_tokens(human) + estimate_tokens(ai)
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                entry = [deque(maxlen=self.max_turns), now]
+                self._sessions[key] = entry
+            turns = entry[0]
+            turns.append((human, ai, tokens))
+            while len(turns) > 1 and sum(t for _, _, t in turns) > self.token_budget:
+                turns.popleft()
+            entry[1] = now
+            self._sessions.move_to_end(key)
+            self._evict(now)
+
+    def clear(self, key):
+        with self._lock:
+            self._sessions.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "turns": sum(len(e[0]) for e in self._sessions.values()),
+                "evictions": self.evictions,
+            }
+
+
+session_memory = SessionMemoryStore(
+    max_sessions=MEMORY_MAX_SESSIONS,
+    max_turns=MEMORY_MAX_TURNS,
+    token_budget=MEMORY_TOKEN_BUDGET,
+    idle_ttl=MEMORY_IDLE_TTL_SECONDS,
+)
@@ -0,0 +1,141 @@
+"""
+Prometheus metrics and per-request timing traces for the agent hot paths.
+
+Every timing goes to a Prometheus histogram (scraped at /metrics) and,
+when a request trace is active, into that request's RequestTrace so the
+caller can get a JSON breakdown of where its time went: LLM calls with
+token counts, tool calls, STS assume-role, RAG retrieval and iterations.
+"""
+import contextlib
+import threading
+import time
+from contextvars import ContextVar
+
+from langchain_core.callbacks import BaseCallbackHandler
+from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest
+
+from app.memory import estimate_tokens
+
+_SECONDS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+_TOKENS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+HTTP_SECONDS = Histogram("http_request_seconds", "HTTP time to response start", ["method", "route", "status"], buckets=_SECONDS)
+AGENT_SECONDS = Histogram("agent_request_seconds", "Time to answer a question", ["path"], buckets=_SECONDS)
+AGENT_ITERATIONS = Histogram("agent_iterations", "LLM round trips per agent-answered question", buckets=(1, 2, 3, 4, 6, 8, 12, 16, 25))
+LLM_SECONDS = Histogram("llm_call_seconds", "Latency of one LLM call", buckets=_SECONDS)
+LLM_PROMPT_TOKENS = Histogram("llm_prompt_tokens", "Prompt tokens per LLM call", buckets=_TOKENS)
+LLM_COMPLETION_TOKENS = Histogram("llm_completion_tokens", "Completion tokens per LLM call", buckets=_TOKENS)
+TOOL_SECONDS = Histogram("tool_call_seconds", "Latency of one tool call", ["tool"], buckets=_SECONDS)
+STS_SECONDS = Histogram("aws_sts_assume_role_seconds", "STS AssumeRole latency", buckets=_SECONDS)
+RAG_SECONDS = Histogram("rag_retrieval_seconds", "Embed + vector search latency", buckets=_SECONDS)
+
+current_trace: ContextVar["RequestTrace | None"] = ContextVar("current_trace", default=None)
+
+
+class RequestTrace:
+    """Timing spans for one request; shared by every thread working on it."""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans: list[dict] = []
+        self.iterations = 0
+
+    def add(self, kind: str, seconds: float, **attrs):
+        with self._lock:
+            self.spans.append({
+                "kind": kind,
+                "at": round(time.perf_counter() - self._started - seconds, 3),
+                "seconds": round(seconds, 3),
+                **attrs,
+            })
+
+    def summary(self) -> dict:
+        with self._lock:
+            spans = list(self.spans)
+
+        def total(kind):
+            return round(sum(s["seconds"] for s in spans if s["kind"] == kind), 3)
+
+        llm = [s for s in spans if s["kind"] == "llm"]
+        return {
+            "total_seconds": round(time.perf_counter() - self._started, 3),
+            "iterations": self.iterations,
+            "llm": {
+                "calls": len(llm),
+                "seconds": total("llm"),
+                "prompt_tokens": sum(s["prompt_tokens"] for s in llm),
+                "completion_tokens": sum(s["completion_tokens"] for s in llm),
+            },
+            "tool_seconds": total("tool"),
+            "sts_seconds": total("sts"),
+            "rag_seconds": total("rag"),
+            "spans": spans,
+        }
+
+
+def record(kind: str, seconds: float, **attrs):
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add(kind, seconds, **attrs)
+
+
+@contextlib.contextmanager
+def timed(histogram: Histogram, kind: str):
+    """Observe the block's duration in `histogram` and the current trace."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        histogram.observe(seconds)
+        record(kind, seconds)
+
+
+def _token_counts(response, prompts: list[str]) -> tuple[int, int]:
+    """(prompt, completion) tokens — Ollama's own counts when reported, else estimated."""
+    generation = response.generations[0][0] if response.generations and response.generations[0] else None
+    info = (generation.generation_info if generation else None) or {}
+    prompt = info.get("prompt_eval_count") or sum(estimate_tokens(p) for p in prompts)
+    completion = info.get("eval_count") or (estimate_tokens(generation.text) if generation else 0)
+    return prompt, completion
+
+
+class MetricsCallback(BaseCallbackHandler):
+    """Times LLM and tool calls of one run into the histograms and `trace`."""
+
+    def __init__(self, trace: RequestTrace):
+        self.trace = trace
+        self._runs = {}
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._runs[run_id] = (time.perf_counter(), prompts)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        started, prompts = self._runs.pop(run_id, (time.perf_counter(), []))
+        seconds = time.perf_counter() - started
+        prompt_tokens, completion_tokens = _token_counts(response, prompts)
+        LLM_SECONDS.observe(seconds)
+        LLM_PROMPT_TOKENS.observe(prompt_tokens)
+        LLM_COMPLETION_TOKENS.observe(completion_tokens)
+        self.trace.iterations += 1
+        self.trace.add("llm", seconds, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._runs.pop(run_id, None)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._runs[run_id] = (time.perf_counter(), serialized.get("name", "tool"))
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        started, name = self._runs.pop(run_id, (time.perf_counter(), "tool"))
+        seconds = time.perf_counter() - started
+        TOOL_SECONDS.labels(tool=name).observe(seconds)
+        self.trace.add("tool", seconds, tool=name)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._runs.pop(run_id, None)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -4,3 +4,6 @@ class CommandRequest(BaseModel):
     command: str
     params: dict | None = None
     account_id: str | None = None
+    account_ids: list[str] | None = None  # several accounts at once; overrides account_id
+    session_id: str | None = None
+    trace: bool = False  # include a per-request timing breakdown in the response
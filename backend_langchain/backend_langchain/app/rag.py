@@ -1,23 +1,82 @@
-import chromadb
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import SentenceTransformerEmbeddings
-from langchain.tools import tool
-
-# Local embeddings — no OpenAI key needed
-embedding_fn = SentenceTransformerEmbeddings(model_name="all-MiniLM-L6-v2")
-
 import os
+from langchain.tools import tool
+from app.config import (
+    EMBEDDING_BATCH_WAIT_MS,
+    EMBEDDING_CACHE_SIZE,
+    EMBEDDING_MAX_BATCH,
+    EMBEDDING_MODEL,
+    EMBEDDING_QUANTIZE,
+    INDEX_REFRESH_SECONDS,
+    INDEX_SNAPSHOT_DIR,
+    RAG_CANDIDATES,
+    RAG_CONTEXT_TOKENS,
+)
+from app.context_budget import build_context
+from app.lifecycle import LazyComponent
+from app.metrics import RAG_SECONDS, timed
+from app.vector_index import SnapshotIndex
 
 # Connect to running ChromaDB container
 CHROMA_HOST = os.getenv("CHROMA_HOST", "chroma")
 CHROMA_PORT = int(os.getenv("CHROMA_PORT", 8000))
-chroma_client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
 
-vectorstore = Chroma(
-    client=chroma_client,
-    collection_name="aws_docs",
-    embedding_function=embedding_fn,
-)
+
+# Heavy imports live inside the factories so importing this module stays cheap
+def _build_embeddings():
+    from app.embeddings import BatchingEmbeddings
+
+    # Local embeddings — no OpenAI key needed. Same model as ingestion.
+    return BatchingEmbeddings(
+        model_name=EMBEDDING_MODEL,
+        cache_size=EMBEDDING_CACHE_SIZE,
+        max_batch=EMBEDDING_MAX_BATCH,
+        wait_ms=EMBEDDING_BATCH_WAIT_MS,
+        quantize=EMBEDDING_QUANTIZE,
+    )
+
+
+def _build_vectorstore():
+    import chromadb
+    from langchain_community.vectorstores import Chroma
+
+    chroma_client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+    return Chroma(
+        client=chroma_client,
+        collection_name="aws_docs",
+        embedding_function=get_embedding_fn(),
+    )
+
+
+# In-process fast path; Chroma is only used when no snapshot has been exported
+snapshot_index = SnapshotIndex(INDEX_SNAPSHOT_DIR, INDEX_REFRESH_SECONDS)
+
+_embeddings = LazyComponent("embeddings", _build_embeddings)
+# With a snapshot loaded, retrieval doesn't touch Chroma, so it doesn't gate readiness
+_vectorstore = LazyComponent("vectorstore", _build_vectorstore, optional_when=snapshot_index.available)
+
+
+def get_embedding_fn():
+    return _embeddings.get()
+
+
+def get_vectorstore():
+    return _vectorstore.get()
+
+
+def retrieve(query: str, k: int = 4):
+    """Top-k docs for the query, from the local snapshot when present, else Chroma."""
+    with timed(RAG_SECONDS, "rag"):
+        query_vec = get_embedding_fn().embed_query(query)
+        docs = snapshot_index.search(query_vec, k=k)
+        if docs is None:
+            docs = get_vectorstore().similarity_search_by_vector(query_vec, k=k)
+    return docs
+
+
+def get_embedding_stats() -> dict:
+    # Don't force the model to load just to report stats
+    return get_embedding_fn().stats() if _embeddings.state == "ready" else {"state": _embeddings.state}
+
 
 @tool
 def rag_search(query: str) -> str:
@@ -27,7 +86,7 @@ def rag_search(query: str) -> str:
     Use this when asked about internal processes, service ownership,
     deployment conventions, team contacts, or anything not available via AWS APIs.
     """
-    docs = vectorstore.similarity_search(query, k=4)
+    docs = retrieve(query, k=RAG_CANDIDATES)
     if not docs:
         return "No relevant documentation found in internal knowledge base."
-    return "\n\n---\n\n".join([d.page_content for d in docs])
+    return build_context([(d.page_content, d.metadata) for d in docs], RAG_CONTEXT_TOKENS)
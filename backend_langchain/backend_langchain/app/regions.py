@@ -0,0 +1,106 @@
+"""
+Concurrent multi-region scans for the regional tools (EC2, EKS, ECS).
+
+A tool input containing `region:all` scans every region in
+AWS_SCAN_REGIONS; `region:eu-west-1,us-east-1` scans just those. Each
+region runs in its own worker with its own pooled client. Regions that
+error or miss the REGION_SCAN_TIMEOUT_SECONDS deadline are reported
+alongside the partial results instead of holding up the answer.
+
+The deadline runs from when a region's worker starts, so regions queued
+behind other requests' scans are not counted as timed out before they
+begin; a region still queued after one deadline is cancelled. Scan
+workers use clients whose timeouts and retries fit inside the deadline
+(app.aws_client), so an abandoned region frees its worker soon after.
+"""
+import contextvars
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from app.config import AWS_SCAN_REGIONS, REGION_SCAN_TIMEOUT_SECONDS, REGION_SCAN_WORKERS
+from app.context import in_region_scan
+
+_REGION_TOKEN_RE = re.compile(r"\bregions?:(\S+)", re.I)
+# Leads the line format_failures adds; outputs carrying it must not be cached
+PARTIAL_RESULTS = "Partial results — no data from:"
+
+_pool = ThreadPoolExecutor(max_workers=REGION_SCAN_WORKERS, thread_name_prefix="region-scan")
+
+
+@dataclass
+class RegionResult:
+    region: str
+    value: object = None
+    error: str | None = None
+
+
+def split_regions(tool_input: str) -> tuple[list[str] | None, str]:
+    """Pull a region:... token out of the input: (regions or None, remaining input)."""
+    match = _REGION_TOKEN_RE.search(tool_input or "")
+    if not match:
+        return None, tool_input
+    value = match.group(1).lower()
+    regions = list(AWS_SCAN_REGIONS) if value == "all" else [r for r in value.split(",") if r]
+    rest = (tool_input[:match.start()] + tool_input[match.end():]).strip()
+    return regions, rest
+
+
+def _scan_one(fn, region: str, started: dict, index: int):
+    started[index] = time.monotonic()
+    in_region_scan.set(True)
+    return fn(region)
+
+
+def scan_regions(fn, regions: list[str], timeout: float = REGION_SCAN_TIMEOUT_SECONDS) -> list[RegionResult]:
+    """Call fn(region) for every region at once; results in region order, failures included."""
+    started: dict[int, float] = {}  # region index -> when its worker picked it up
+    # Each worker gets a copy of the request context (account id, trace)
+    futures = [
+        _pool.submit(contextvars.copy_context().run, _scan_one, fn, r, started, i)
+        for i, r in enumerate(regions)
+    ]
+    queued_until = time.monotonic() + timeout
+    expired: dict[int, str] = {}
+    while True:
+        now = time.monotonic()
+        deadlines = {}
+        for i, future in enumerate(futures):
+            if future.done() or i in expired:
+                continue
+            if i in started:
+                deadlines[i] = started[i] + timeout
+            elif now < queued_until:
+                deadlines[i] = queued_until
+            elif future.cancel():
+                expired[i] = f"not started within {timeout:g}s (scan workers busy)"
+            else:
+                deadlines[i] = now + timeout  # picked up just now
+        for i, deadline in list(deadlines.items()):
+            if deadline <= now and not futures[i].done():
+                expired[i] = f"timed out after {timeout:g}s"
+                del deadlines[i]
+        if not deadlines:
+            break
+        wait([futures[i] for i in deadlines], timeout=min(deadlines.values()) - now, return_when=FIRST_COMPLETED)
+
+    results = []
+    for i, (region, future) in enumerate(zip(regions, futures)):
+        if i in expired:
+            results.append(RegionResult(region, error=expired[i]))
+        elif future.exception() is not None:
+            results.append(RegionResult(region, error=str(future.exception())))
+        else:
+            results.append(RegionResult(region, value=future.result()))
+    return results
+
+
+def format_failures(results: list[RegionResult]) -> list[str]:
+    failed = [f"{r.region} ({r.error})" for r in results if r.error]
+    return [f"{PARTIAL_RESULTS} {', '.join(failed)}"] if failed else []
+
+
+def is_partial(output) -> bool:
+    """True for a tool output that is missing some regions' data."""
+    return isinstance(output, str) and PARTIAL_RESULTS in output
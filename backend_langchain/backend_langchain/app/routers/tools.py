@@ -1,23 +1,179 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+import threading
+import time
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from app.models.schemas import CommandRequest
-from app.agent import run_agent
+from app.admission import QueueFull, agent_admission
+from app.agent_stats import agent_mode_stats
+from app.agent import arun_agent, run_agent, tool_selector
+from app.answer_cache import answer_cache
+from app.aws_client import get_client_cache_stats
+from app.cache import flush_caches, get_cache_stats
+from app.context import current_account_id
+from app.fast_path import get_fast_path_stats
+from app.json_agent import json_agent_stats
+from app.memory import session_memory
+from app.rag import get_embedding_stats, snapshot_index
+from app.services.codepipeline_tools import collect_pipeline_statuses
+from app.streaming import StreamingEventHandler
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+def _queue_full(e: QueueFull) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=f"Agent is busy ({e.waiting} requests queued). Please retry shortly.",
+        headers={"Retry-After": "5"},
+    )
+
+
 @router.post("/execute")
-def execute(request: CommandRequest):
+async def execute(request: CommandRequest):
     """
     Main endpoint. Receives a natural language query from the UI,
     runs it through the LangChain agent, returns a human-friendly response.
+    Runs are admission-controlled; a full queue returns 429 straight away.
     """
     if not request.command or not request.command.strip():
         raise HTTPException(status_code=400, detail="Command cannot be empty.")
 
     try:
-        answer = run_agent(request.command, account_id=request.account_id)
-        return {"response": answer}
+        async with agent_admission.slot():
+            result = await arun_agent(
+                request.command,
+                account_id=request.account_id,
+                session_id=request.session_id,
+                account_ids=request.account_ids,
+            )
+        response = {"response": result["output"], "path": result["path"]}
+        if request.trace:
+            response["trace"] = result["trace"]
+        return response
+    except QueueFull as e:
+        raise _queue_full(e)
     except Exception as e:
         logger.exception(f"Error executing command: {request.command}")
         raise HTTPException(status_code=500, detail=f"Backend error: {str(e)}")
+
+
+@router.post("/execute/stream")
+async def execute_stream(request: CommandRequest, http_request: Request):
+    """
+    Streaming variant of /execute. Emits NDJSON events as the agent works:
+    start, thought, tool_start, tool_end or tool_error (with latency), token
+    (final-answer tokens) and final. The agent run is cancelled if the client disconnects.
+    """
+    if not request.command or not request.command.strip():
+        raise HTTPException(status_code=400, detail="Command cannot be empty.")
+
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+
+    def emit(event: dict):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    def run():
+        started = time.perf_counter()
+        try:
+            handler = StreamingEventHandler(emit, cancelled)
+            result = run_agent(
+                request.command,
+                account_id=request.account_id,
+                callbacks=[handler],
+                session_id=request.session_id,
+                account_ids=request.account_ids,
+            )
+            final = {
+                "type": "final",
+                "text": result["output"],
+                "path": result["path"],
+                "seconds": round(time.perf_counter() - started, 3),
+            }
+            if request.trace:
+                final["trace"] = result["trace"]
+            emit(final)
+        finally:
+            emit(None)
+
+    async def event_stream():
+        yield json.dumps({"type": "start"}) + "\n"
+        if agent_admission.active >= agent_admission.max_concurrent:
+            yield json.dumps({"type": "queued", "position": agent_admission.waiting + 1}) + "\n"
+
+        task = None
+        try:
+            await agent_admission.acquire()
+            try:
+                task = loop.run_in_executor(None, run)
+            except BaseException:
+                agent_admission.release()
+                raise
+            # The slot is held until the worker thread finishes, not just until the client leaves
+            task.add_done_callback(lambda _: agent_admission.release())
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    if await http_request.is_disconnected():
+                        break
+                    continue
+                if event is None:
+                    break
+                yield json.dumps(event) + "\n"
+        except QueueFull as e:
+            yield json.dumps({"type": "error", "status": 429, "detail": str(e)}) + "\n"
+        finally:
+            cancelled.set()
+            if task is not None and not task.done():
+                logger.info("Client disconnected, cancelling agent run")
+
+    # Reject before the 200 starts streaming if there is no room to queue
+    if agent_admission.waiting >= agent_admission.max_queue:
+        raise _queue_full(QueueFull(agent_admission.waiting))
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
+@router.get("/stats")
+def stats():
+    """Cache and performance counters for the backend's hot paths."""
+    return {
+        "aws_client": get_client_cache_stats(),
+        "caches": get_cache_stats(),
+        "fast_path": get_fast_path_stats(),
+        "admission": agent_admission.stats(),
+        "memory": session_memory.stats(),
+        "answer_cache": answer_cache.stats(),
+        "embeddings": get_embedding_stats(),
+        "vector_index": snapshot_index.stats(),
+        "tool_selection": tool_selector.stats(),
+        "agent_modes": agent_mode_stats.stats(),
+        "json_agent_replies": json_agent_stats.stats(),
+    }
+
+
+@router.get("/pipelines/status")
+def pipelines_status(account_id: str | None = None):
+    """Fleet-wide pipeline overview: failed, in-progress and succeeded pipelines."""
+    current_account_id.set(account_id or "default")
+    try:
+        return collect_pipeline_statuses()
+    except Exception as e:
+        logger.exception("Error collecting pipeline statuses")
+        raise HTTPException(status_code=500, detail=f"Backend error: {str(e)}")
+
+
+@router.post("/admin/cache/flush")
+def flush_cache(prefix: str | None = None):
+    """
+    Flush cached AWS results. `prefix` limits the flush to matching caches,
+    e.g. 'tool:get_ssm' or 'pipeline_'; without it the answer cache is cleared too.
+    """
+    flushed = flush_caches(prefix)
+    if prefix is None:
+        answer_cache.flush()
+    return {"flushed": flushed}
@@ -1,13 +1,28 @@
 import boto3
+import heapq
 import json
+import re
+from collections import Counter
 from langchain.tools import tool
 from app.aws_client import get_boto_client
+from app.cache import cached_tool
+from app.config import (
+    EC2_MAX_ROWS,
+    TOOL_CACHE_LONG_TTL_SECONDS,
+    TOOL_CACHE_MEDIUM_TTL_SECONDS,
+    TOOL_CACHE_SHORT_TTL_SECONDS,
+)
+from app.extractors import EC2_STATES, INSTANCE_TYPE_RE
+from app.fanout import fan_out
+from app.regions import format_failures, scan_regions, split_regions
 
 
 # ─────────────────────────────────────────────
 # S3
 # ─────────────────────────────────────────────
 @tool
+@fan_out
+@cached_tool("list_s3_buckets", ttl=TOOL_CACHE_LONG_TTL_SECONDS)
 def list_s3_buckets(query: str = "") -> str:
     """List all S3 buckets in the AWS account."""
     try:
@@ -22,18 +37,49 @@ def list_s3_buckets(query: str = "") -> str:
 # ─────────────────────────────────────────────
 # EC2
 # ─────────────────────────────────────────────
-@tool
-def describe_ec2_instances(filter_by: str = "") -> str:
-    """
-    List EC2 instances with their state, type, and name tag.
-    Optionally filter by instance name or state (e.g. 'running').
-    """
-    try:
-        ec2 = get_boto_client("ec2")
-        response = ec2.describe_instances()
-        instances = []
+def _ec2_filters(filter_by: str) -> list[dict]:
+    """Turn free-text filter input into AWS-side describe_instances Filters."""
+    states, types, name_parts = [], [], []
+    for token in re.split(r"[\s,]+", filter_by.strip()):
+        low = token.lower()
+        if not low:
+            continue
+        if low in EC2_STATES:
+            states.append(low)
+        elif INSTANCE_TYPE_RE.match(low):
+            types.append(low)
+        else:
+            name_parts.append(token)
+
+    filters = []
+    if states:
+        filters.append({"Name": "instance-state-name", "Values": states})
+    if types:
+        filters.append({"Name": "instance-type", "Values": types})
+    if name_parts:
+        # Tag filters are case-sensitive, so match the name as typed and lower-cased
+        name = " ".join(name_parts)
+        filters.append({"Name": "tag:Name", "Values": sorted({f"*{name}*", f"*{name.lower()}*"})})
+    return filters
+
+
+def _format_counts(counter: Counter, limit: int = 10) -> str:
+    return ", ".join(f"{k}={v}" for k, v in counter.most_common(limit))
 
-        for reservation in response["Reservations"]:
+
+def _scan_ec2(filters: list[dict], region: str | None = None):
+    """(total, by_state, by_type, newest rows heap) for one region; rows carry the region when given."""
+    ec2 = get_boto_client("ec2", region)
+    paginator = ec2.get_paginator("describe_instances")
+    pages = paginator.paginate(Filters=filters, PaginationConfig={"PageSize": 1000})
+
+    total = 0
+    by_state, by_type = Counter(), Counter()
+    newest = []  # min-heap of the EC2_MAX_ROWS most recently launched instances
+    suffix = f" | {region}" if region else ""
+
+    for page in pages:
+        for reservation in page["Reservations"]:
             for inst in reservation["Instances"]:
                 name = next(
                     (t["Value"] for t in inst.get("Tags", []) if t["Key"] == "Name"),
@@ -43,14 +89,74 @@ def describe_ec2_instances(filter_by: str = "") -> str:
                 itype = inst["InstanceType"]
                 iid = inst["InstanceId"]
 
-                if filter_by and filter_by.lower() not in name.lower() and filter_by.lower() != state:
-                    continue
+                total += 1
+                by_state[state] += 1
+                by_type[itype] += 1
+
+                row = (str(inst.get("LaunchTime", "")), iid, f"  - {name} | {iid} | {itype} | {state}{suffix}")
+                if len(newest) < EC2_MAX_ROWS:
+                    heapq.heappush(newest, row)
+                else:
+                    heapq.heappushpop(newest, row)
+
+    return total, by_state, by_type, newest
+
+
+def _format_ec2(total: int, by_state: Counter, by_type: Counter, newest: list, header_extra: list[str] = ()) -> list[str]:
+    rows = [r[2] for r in sorted(newest, reverse=True)[:EC2_MAX_ROWS]]
+    lines = [
+        f"EC2 Instances ({total} matching):",
+        *header_extra,
+        f"  By state: {_format_counts(by_state)}",
+        f"  By type:  {_format_counts(by_type)}",
+    ]
+    if total > len(rows):
+        lines.append(f"Most recently launched ({len(rows)} of {total}):")
+    else:
+        lines.append("Instances:")
+    return lines + rows
+
+
+def _describe_ec2_regions(regions: list[str], filters: list[dict]) -> str:
+    results = scan_regions(lambda r: _scan_ec2(filters, r), regions)
+    total, by_state, by_type, newest, by_region = 0, Counter(), Counter(), [], Counter()
+    for r in results:
+        if r.value is None:
+            continue
+        count, states, types, rows = r.value
+        total += count
+        by_state.update(states)
+        by_type.update(types)
+        newest.extend(rows)
+        by_region[r.region] = count
 
-                instances.append(f"  - {name} | {iid} | {itype} | {state}")
+    if not total:
+        return "\n".join(["No EC2 instances found in " + ", ".join(regions) + "."] + format_failures(results))
+    header = [f"  By region: {_format_counts(by_region, limit=len(regions))}"]
+    return "\n".join(_format_ec2(total, by_state, by_type, newest, header) + format_failures(results))
 
-        if not instances:
+
+@tool
+@fan_out
+@cached_tool("describe_ec2_instances", ttl=TOOL_CACHE_MEDIUM_TTL_SECONDS)
+def describe_ec2_instances(filter_by: str = "") -> str:
+    """
+    List EC2 instances with their state, type, and name tag.
+    Optionally filter by any mix of state (e.g. 'running'), instance type
+    (e.g. 't3.micro') and name, e.g. 'running t3.micro payments'.
+    Add 'region:all' (or 'region:eu-west-1,us-east-1') to scan several regions.
+    Large fleets return counts by state and type plus the most recently launched instances.
+    """
+    try:
+        regions, filter_by = split_regions(filter_by)
+        filters = _ec2_filters(filter_by)
+        if regions:
+            return _describe_ec2_regions(regions, filters)
+
+        total, by_state, by_type, newest = _scan_ec2(filters)
+        if not total:
             return "No EC2 instances found."
-        return f"EC2 Instances:\n" + "\n".join(instances)
+        return "\n".join(_format_ec2(total, by_state, by_type, newest))
     except Exception as e:
         return f"Error describing EC2 instances: {str(e)}"
 
@@ -58,14 +164,37 @@ def describe_ec2_instances(filter_by: str = "") -> str:
 # ─────────────────────────────────────────────
 # ECS
 # ─────────────────────────────────────────────
+def _describe_ecs_service(cluster: str, service: str, region: str | None = None) -> dict | None:
+    ecs = get_boto_client("ecs", region)
+    services = ecs.describe_services(cluster=cluster, services=[service]).get("services", [])
+    return services[0] if services else None
+
+
+def _format_ecs(svc: dict, cluster: str, region: str | None = None) -> str:
+    return (
+        f"ECS Service: {svc['serviceName']}\n"
+        f"  Cluster:  {cluster}\n"
+        + (f"  Region:   {region}\n" if region else "")
+        + f"  Status:   {svc['status']}\n"
+        f"  Desired:  {svc['desiredCount']}\n"
+        f"  Running:  {svc['runningCount']}\n"
+        f"  Pending:  {svc['pendingCount']}\n"
+        f"  Task Def: {svc['taskDefinition'].split('/')[-1]}"
+    )
+
+
 @tool
+@fan_out
+@cached_tool("get_ecs_service_status", ttl=TOOL_CACHE_SHORT_TTL_SECONDS)
 def get_ecs_service_status(cluster_and_service: str) -> str:
     """
     Get ECS service deployment status.
     Input format: 'cluster-name/service-name' or just 'service-name'.
     Example: 'payments-cluster/payments-service' or 'payments-service'
+    Add 'region:all' (or 'region:eu-west-1,us-east-1') to look in several regions.
     """
     try:
+        regions, cluster_and_service = split_regions(cluster_and_service)
         parts = cluster_and_service.strip().split("/")
         if len(parts) == 2:
             cluster, service = parts[0], parts[1]
@@ -73,23 +202,19 @@ def get_ecs_service_status(cluster_and_service: str) -> str:
             cluster = "default"
             service = parts[0]
 
-        ecs = get_boto_client("ecs")
-        response = ecs.describe_services(cluster=cluster, services=[service])
-        services = response.get("services", [])
+        if regions:
+            results = scan_regions(lambda r: _describe_ecs_service(cluster, service, r), regions)
+            found = [_format_ecs(r.value, cluster, r.region) for r in results if r.value]
+            missing = [r.region for r in results if not r.value and not r.error]
+            lines = found or [f"No ECS service found: {service} in cluster {cluster} in any scanned region"]
+            if found and missing:
+                lines.append(f"Not present in: {', '.join(missing)}")
+            return "\n".join(lines + format_failures(results))
 
-        if not services:
+        svc = _describe_ecs_service(cluster, service)
+        if not svc:
             return f"No ECS service found: {service} in cluster {cluster}"
-
-        svc = services[0]
-        return (
-            f"ECS Service: {svc['serviceName']}\n"
-            f"  Cluster:  {cluster}\n"
-            f"  Status:   {svc['status']}\n"
-            f"  Desired:  {svc['desiredCount']}\n"
-            f"  Running:  {svc['runningCount']}\n"
-            f"  Pending:  {svc['pendingCount']}\n"
-            f"  Task Def: {svc['taskDefinition'].split('/')[-1]}"
-        )
+        return _format_ecs(svc, cluster)
     except Exception as e:
         return f"Error fetching ECS service status: {str(e)}"
 
@@ -98,9 +223,21 @@ def get_ecs_service_status(cluster_and_service: str) -> str:
 # EKS
 # ─────────────────────────────────────────────
 @tool
+@fan_out
+@cached_tool("list_eks_clusters", ttl=TOOL_CACHE_LONG_TTL_SECONDS)
 def list_eks_clusters(query: str = "") -> str:
-    """List all EKS clusters in the AWS account."""
+    """
+    List all EKS clusters in the AWS account.
+    Input 'region:all' (or 'region:eu-west-1,us-east-1') to list across several regions.
+    """
     try:
+        regions, _ = split_regions(query)
+        if regions:
+            results = scan_regions(lambda r: get_boto_client("eks", r).list_clusters().get("clusters", []), regions)
+            rows = [f"  - {c} ({r.region})" for r in results if r.value for c in r.value]
+            lines = ["EKS Clusters:", *rows] if rows else ["No EKS clusters found in " + ", ".join(regions) + "."]
+            return "\n".join(lines + format_failures(results))
+
         eks = get_boto_client("eks")
         response = eks.list_clusters()
         clusters = response.get("clusters", [])
@@ -112,6 +249,8 @@ def list_eks_clusters(query: str = "") -> str:
 
 
 @tool
+@fan_out
+@cached_tool("describe_eks_cluster", ttl=TOOL_CACHE_LONG_TTL_SECONDS)
 def describe_eks_cluster(cluster_name: str) -> str:
     """
     Get detailed status of an EKS cluster by name.
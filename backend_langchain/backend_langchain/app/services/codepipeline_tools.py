@@ -1,13 +1,29 @@
 import boto3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from langchain.tools import tool
 from app.aws_client import get_boto_client
+from app.cache import TTLCache, cached_tool
+from app.config import (
+    PIPELINE_DEFINITION_TTL_SECONDS,
+    PIPELINE_STATE_TTL_SECONDS,
+    PIPELINE_STATUS_WORKERS,
+    TOOL_CACHE_LONG_TTL_SECONDS,
+)
+from app.context import current_account_id
+from app.fanout import fan_out
 
 
-def _get_pipeline_overall_status(pipeline_name: str) -> dict:
-    cp = get_boto_client("codepipeline")
-    state = cp.get_pipeline_state(name=pipeline_name)
+_definitions = TTLCache("pipeline_definitions", ttl=PIPELINE_DEFINITION_TTL_SECONDS)
+_states = TTLCache("pipeline_states", ttl=PIPELINE_STATE_TTL_SECONDS)
+
+# Used to fetch state and definition side by side
+_fetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="codepipeline")
+
+
+def _overall_status(state: dict) -> dict:
     executions = []
-    for stage in state["stageStates"]:
+    for stage in state.get("stageStates", []):
         exc = stage.get("latestExecution")
         if exc:
             executions.append(exc)
@@ -23,33 +39,80 @@ def _get_pipeline_overall_status(pipeline_name: str) -> dict:
     }
 
 
-def _get_pipeline_source(pipeline_name: str) -> dict:
-    cp = get_boto_client("codepipeline")
-    pipeline = cp.get_pipeline(name=pipeline_name)
-    for stage in pipeline["pipeline"]["stages"]:
-        if stage["name"].lower() == "source":
-            action = stage["actions"][0]
-            cfg = action["configuration"]
-            return {
-                "provider": action["actionTypeId"]["provider"],
-                "repo": cfg.get("FullRepositoryId"),
-                "branch": cfg.get("BranchName"),
-            }
-    return {}
-
-
-def _get_commit_id(pipeline_name: str) -> str:
-    cp = get_boto_client("codepipeline")
-    state = cp.get_pipeline_state(name=pipeline_name)
-    for stage in state["stageStates"]:
-        if stage["stageName"].lower() == "source":
-            for action in stage.get("actionStates", []):
-                exc = action.get("latestExecution", {})
-                return exc.get("externalExecutionId", "N/A")
-    return "N/A"
+@dataclass
+class PipelineSnapshot:
+    """One pipeline's state + definition, fetched together."""
+    name: str
+    state: dict
+    definition: dict
+
+    @property
+    def overall_status(self) -> dict:
+        return _overall_status(self.state)
+
+    @property
+    def source(self) -> dict:
+        for stage in self.definition["pipeline"]["stages"]:
+            if stage["name"].lower() == "source":
+                action = stage["actions"][0]
+                cfg = action["configuration"]
+                return {
+                    "provider": action["actionTypeId"]["provider"],
+                    "repo": cfg.get("FullRepositoryId"),
+                    "branch": cfg.get("BranchName"),
+                }
+        return {}
+
+    @property
+    def commit_id(self) -> str:
+        for stage in self.state.get("stageStates", []):
+            if stage["stageName"].lower() == "source":
+                for action in stage.get("actionStates", []):
+                    exc = action.get("latestExecution", {})
+                    return exc.get("externalExecutionId", "N/A")
+        return "N/A"
 
 
+def _get_pipeline_state(cp, pipeline_name: str, account_id: str | None = None) -> dict:
+    """get_pipeline_state through the short-TTL cache. Pass account_id when called off the request thread."""
+    key = (account_id or current_account_id.get(), pipeline_name)
+    return _states.get_or_load(key, lambda: cp.get_pipeline_state(name=pipeline_name))
+
+
+def _list_pipeline_names(cp) -> list[str]:
+    names = []
+    for page in cp.get_paginator("list_pipelines").paginate():
+        names.extend(p["name"] for p in page.get("pipelines", []))
+    return names
+
+
+def _get_pipeline_snapshot(pipeline_name: str) -> PipelineSnapshot:
+    """
+    Build a snapshot from at most one get_pipeline_state and one get_pipeline
+    call, issued concurrently. Both halves are cached per account.
+    """
+    key = (current_account_id.get(), pipeline_name)
+    state = _states.get(key)
+    definition = _definitions.get(key)
+
+    if state is None or definition is None:
+        cp = get_boto_client("codepipeline")
+        state_future = None
+        if state is None:
+            state_future = _fetch_pool.submit(_get_pipeline_state, cp, pipeline_name, key[0])
+        if definition is None:
+            definition = cp.get_pipeline(name=pipeline_name)
+            _definitions.set(key, definition)
+        if state_future is not None:
+            state = state_future.result()
+
+    return PipelineSnapshot(name=pipeline_name, state=state, definition=definition)
+
+
+# No cached_tool on the status tools: pipeline state is already cached for
+# PIPELINE_STATE_TTL_SECONDS, and a second layer would stack the staleness
 @tool
+@fan_out
 def get_pipeline_status(pipeline_name: str) -> str:
     """
     Get the full status of a CodePipeline — including current status,
@@ -57,9 +120,10 @@ def get_pipeline_status(pipeline_name: str) -> str:
     Input: pipeline name, e.g. 'payments-prod-pipeline'
     """
     try:
-        status = _get_pipeline_overall_status(pipeline_name)
-        source = _get_pipeline_source(pipeline_name)
-        commit = _get_commit_id(pipeline_name)
+        snapshot = _get_pipeline_snapshot(pipeline_name)
+        status = snapshot.overall_status
+        source = snapshot.source
+        commit = snapshot.commit_id
 
         return (
             f"Pipeline: {pipeline_name}\n"
@@ -77,6 +141,8 @@ def get_pipeline_status(pipeline_name: str) -> str:
 
 
 @tool
+@fan_out
+@cached_tool("list_pipelines", ttl=TOOL_CACHE_LONG_TTL_SECONDS)
 def list_pipelines(query: str = "") -> str:
     """
     List all CodePipelines in the AWS account.
@@ -84,10 +150,64 @@ def list_pipelines(query: str = "") -> str:
     """
     try:
         cp = get_boto_client("codepipeline")
-        response = cp.list_pipelines()
-        pipelines = [p["name"] for p in response.get("pipelines", [])]
+        pipelines = _list_pipeline_names(cp)
         if not pipelines:
             return "No pipelines found."
         return "Available Pipelines:\n" + "\n".join(f"  - {p}" for p in pipelines)
     except Exception as e:
         return f"Error listing pipelines: {str(e)}"
+
+
+def collect_pipeline_statuses() -> dict:
+    """
+    Status of every pipeline in the current account, grouped by overall status.
+    Lists all pages, then fetches states through a bounded worker pool.
+    """
+    account_id = current_account_id.get()
+    cp = get_boto_client("codepipeline")
+    names = _list_pipeline_names(cp)
+
+    groups = {"Failed": [], "InProgress": [], "Succeeded": [], "Unknown": []}
+    with ThreadPoolExecutor(max_workers=PIPELINE_STATUS_WORKERS, thread_name_prefix="pipeline-status") as pool:
+        futures = {pool.submit(_get_pipeline_state, cp, name, account_id): name for name in names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                status = _overall_status(future.result())
+            except Exception as e:
+                groups["Unknown"].append({"name": name, "error": str(e)})
+                continue
+            bucket = status.get("status") if status.get("status") in groups else "Unknown"
+            groups[bucket].append({"name": name, "lastStatusChange": status.get("lastStatusChange", "")})
+
+    for rows in groups.values():
+        rows.sort(key=lambda r: r["name"])
+    return {"total": len(names), **groups}
+
+
+@tool
+@fan_out
+def get_all_pipeline_statuses(query: str = "") -> str:
+    """
+    Status overview of EVERY CodePipeline in the account in one call:
+    failed, in-progress and succeeded pipelines.
+    Use this for questions like 'which pipelines are failing?' instead of
+    calling get_pipeline_status for each pipeline.
+    """
+    try:
+        result = collect_pipeline_statuses()
+        if not result["total"]:
+            return "No pipelines found."
+
+        lines = [f"Pipeline overview ({result['total']} total):"]
+        for label in ("Failed", "InProgress"):
+            rows = result[label]
+            lines.append(f"{label} ({len(rows)}):")
+            lines.extend(f"  - {r['name']} | {r['lastStatusChange']}" for r in rows)
+        succeeded = result["Succeeded"]
+        lines.append(f"Succeeded ({len(succeeded)}): " + ", ".join(r["name"] for r in succeeded))
+        if result["Unknown"]:
+            lines.append(f"Unknown ({len(result['Unknown'])}): " + ", ".join(r["name"] for r in result["Unknown"]))
+        return "\n".join(lines)
+    except Exception as e:
+        return f"Error fetching pipeline statuses: {str(e)}"
@@ -1,9 +1,16 @@
 import boto3
 from langchain.tools import tool
+from app.answer_cache import answer_cache
 from app.aws_client import get_boto_client
+from app.cache import cached_tool
+from app.config import TOOL_CACHE_MEDIUM_TTL_SECONDS
+from app.context import current_account_id, current_account_ids
+from app.fanout import fan_out
 
 
 @tool
+@fan_out
+@cached_tool("get_ssm_parameter", ttl=TOOL_CACHE_MEDIUM_TTL_SECONDS)
 def get_ssm_parameter(parameter_name: str) -> str:
     """
     Fetch an environment variable or config value from AWS SSM Parameter Store.
@@ -21,6 +28,8 @@ def get_ssm_parameter(parameter_name: str) -> str:
 
 
 @tool
+@fan_out
+@cached_tool("list_ssm_parameters", ttl=TOOL_CACHE_MEDIUM_TTL_SECONDS)
 def list_ssm_parameters(path_prefix: str = "/") -> str:
     """
     List available SSM parameters under a given path prefix.
@@ -38,6 +47,16 @@ def list_ssm_parameters(path_prefix: str = "/") -> str:
         return f"Error listing parameters: {str(e)}"
 
 
+def _invalidate_ssm_cache(name: str):
+    """Drop cached reads and cached answers that could include `name` for the current account."""
+    account = current_account_id.get()
+    get_ssm_parameter.func.cache.invalidate(lambda k: k[0] == account and k[1:] == (name,))
+    list_ssm_parameters.func.cache.invalidate(
+        lambda k: k[0] == account and (len(k) == 1 or name.startswith(k[1]))
+    )
+    answer_cache.invalidate(account, ("get_ssm_parameter", "list_ssm_parameters"))
+
+
 @tool
 def put_ssm_parameter(input_str: str) -> str:
     """
@@ -46,6 +65,13 @@ def put_ssm_parameter(input_str: str) -> str:
     Example: '/staging/payments/DB_HOST|db.staging.example.com|staging'
     NOTE: Production changes require DevOps approval and will NOT be applied automatically.
     """
+    # Writes never fan out: refuse rather than guess which account to change
+    accounts = current_account_ids.get()
+    if accounts:
+        return (
+            f"Refusing to write to SSM across several accounts ({', '.join(accounts)}). "
+            f"Writes need a single account_id — please repeat the request for one account."
+        )
     try:
         parts = input_str.strip().split("|")
         if len(parts) != 3:
@@ -71,6 +97,7 @@ def put_ssm_parameter(input_str: str) -> str:
             Type="SecureString",
             Overwrite=True
         )
+        _invalidate_ssm_cache(name)
         return f"✅ Parameter '{name}' updated successfully in {env}."
     except Exception as e:
         return f"Error updating parameter: {str(e)}"
@@ -0,0 +1,83 @@
+import threading
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+class StreamCancelled(Exception):
+    """Raised inside the agent run once the client has gone away."""
+
+
+class StreamingEventHandler(BaseCallbackHandler):
+    """
+    Turns agent callbacks into small JSON-able events (thoughts, tool calls,
+    tool latency, final-answer tokens) and hands them to `emit`.
+    Raising from a callback aborts the run, which is how a client
+    disconnect cancels the agent between tokens.
+    """
+
+    raise_error = True
+
+    def __init__(self, emit, cancelled: threading.Event):
+        self.emit = emit
+        self.cancelled = cancelled
+        self._buffer = ""
+        self._in_final_answer = False
+        self._tool_runs = {}
+
+    def _check_cancelled(self):
+        if self.cancelled.is_set():
+            raise StreamCancelled("client disconnected")
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self._check_cancelled()
+        self._buffer = ""
+        self._in_final_answer = False
+
+    def on_llm_new_token(self, token: str, **kwargs):
+        self._check_cancelled()
+        if self._in_final_answer:
+            self.emit({"type": "token", "text": token})
+            return
+
+        self._buffer += token
+        idx = self._buffer.find(FINAL_ANSWER_MARKER)
+        if idx != -1:
+            self._in_final_answer = True
+            rest = self._buffer[idx + len(FINAL_ANSWER_MARKER):].lstrip()
+            if rest:
+                self.emit({"type": "token", "text": rest})
+
+    def on_agent_action(self, action, **kwargs):
+        self._check_cancelled()
+        thought = action.log.split("Action:")[0].strip()
+        if thought:
+            self.emit({"type": "thought", "text": thought})
+        self.emit({"type": "tool_start", "tool": action.tool, "input": str(action.tool_input)})
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._check_cancelled()
+        self._tool_runs[run_id] = (serialized.get("name", "tool"), time.perf_counter())
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        name, started = self._tool_runs.pop(run_id, ("tool", time.perf_counter()))
+        self.emit({
+            "type": "tool_end",
+            "tool": name,
+            "seconds": round(time.perf_counter() - started, 3),
+            "output": str(output)[:500],
+        })
+        self._check_cancelled()
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        # Close out the tool_start so the client doesn't show the call as still running
+        name, started = self._tool_runs.pop(run_id, ("tool", time.perf_counter()))
+        self.emit({
+            "type": "tool_error",
+            "tool": name,
+            "seconds": round(time.perf_counter() - started, 3),
+            "error": str(error)[:500],
+        })
+        self._check_cancelled()
@@ -0,0 +1,120 @@
+"""
+Per-request tool selection for the ReAct prompt.
+
+Every tool description rendered into the prompt is re-sent on each agent
+iteration, so the prompt only lists the tools relevant to the question:
+keyword rules pick the obvious ones and embedding similarity between the
+question and each tool's description ranks the rest. When the question is
+too vague to rank confidently the full set is used.
+
+The executor itself always holds every tool, so if the model asks for one
+that was left out of the prompt it still runs (and is counted as an
+escalation); a misspelled tool name gets the full list of tool names back.
+"""
+import re
+import threading
+
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+
+from app.lifecycle import LazyComponent
+from app.rag import get_embedding_fn
+
+# Keyword rules: a match puts the tool in the prompt regardless of ranking
+_KEYWORDS = {
+    "rag_search": r"\b(docs?|runbooks?|owners?|owns|who|how|why|explain|guide|documentation)\b",
+    "list_s3_buckets": r"\b(s3|buckets?)\b",
+    "describe_ec2_instances": r"\b(ec2|instances?|vms?|servers?|hosts?)\b",
+    "get_ecs_service_status": r"\b(ecs|tasks?|containers?)\b",
+    "list_eks_clusters": r"\b(eks|kubernetes|k8s|clusters?)\b",
+    "describe_eks_cluster": r"\b(eks|kubernetes|k8s|clusters?)\b",
+    "get_pipeline_status": r"\b(pipelines?|builds?|commit|release)\b",
+    "list_pipelines": r"\bpipelines?\b",
+    "get_all_pipeline_statuses": r"\bpipelines\b|\b(all|every|which|any)\b.*\bpipeline",
+    "get_ssm_parameter": r"\b(ssm|param(eter)?s?|env|environment|variables?|config)\b",
+    "list_ssm_parameters": r"\b(ssm|param(eter)?s?|env|environment|variables?|config)\b",
+    "put_ssm_parameter": r"\b(set|update|change|put|write)\b.*\b(ssm|param(eter)?|env|variable|config)",
+}
+_KEYWORD_BOOST = 1.0
+# Below this best similarity (and with no keyword hit) the question is too vague to trim tools
+_MIN_SIMILARITY = 0.25
+
+
+class ToolSelector:
+    def __init__(self, tools: list, top_k: int, always: tuple = ("rag_search",)):
+        self.tools = tools
+        self.top_k = top_k
+        self.always = set(always)
+        self._keywords = {t.name: re.compile(_KEYWORDS[t.name]) for t in tools if t.name in _KEYWORDS}
+        self._vectors = LazyComponent("tool_vectors", self._embed_tools)
+        self._lock = threading.Lock()
+        self.selections = 0
+        self.full_set = 0
+        self.escalations = 0
+        self.tools_selected = 0
+
+    def _embed_tools(self) -> np.ndarray:
+        texts = [f"{t.name}: {t.description}" for t in self.tools]
+        vecs = np.asarray(get_embedding_fn().embed_documents(texts), dtype=np.float32)
+        return vecs / np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+
+    def _similarities(self, query: str):
+        try:
+            vec = np.asarray(get_embedding_fn().embed_query(query), dtype=np.float32)
+            return self._vectors.get() @ (vec / (np.linalg.norm(vec) or 1.0))
+        except Exception:
+            return None  # keyword rules alone
+
+    def select(self, query: str):
+        """Names of the tools to show for this query (in tool-list order), or None for the full set."""
+        q = query.lower()
+        matched = {name for name, rule in self._keywords.items() if rule.search(q)}
+        sims = self._similarities(query)
+        if not matched and (sims is None or float(sims.max()) < _MIN_SIMILARITY):
+            return self._record(None)
+
+        scores = {
+            t.name: (_KEYWORD_BOOST if t.name in matched else 0.0) + (float(sims[i]) if sims is not None else 0.0)
+            for i, t in enumerate(self.tools)
+        }
+        ranked = sorted((n for n in scores if n not in self.always), key=scores.get, reverse=True)
+        chosen = set(ranked[: self.top_k]) | (self.always & scores.keys())
+        names = tuple(t.name for t in self.tools if t.name in chosen)
+        return self._record(None if len(names) == len(self.tools) else names)
+
+    def _record(self, names):
+        with self._lock:
+            self.selections += 1
+            if names is None:
+                self.full_set += 1
+                self.tools_selected += len(self.tools)
+            else:
+                self.tools_selected += len(names)
+        return names
+
+    def record_escalation(self):
+        with self._lock:
+            self.escalations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "top_k": self.top_k,
+                "selections": self.selections,
+                "full_set": self.full_set,
+                "escalations": self.escalations,
+                "avg_tools": round(self.tools_selected / self.selections, 2) if self.selections else 0.0,
+                "total_tools": len(self.tools),
+            }
+
+
+class EscalationWatcher(BaseCallbackHandler):
+    """Counts agent actions that name a tool which was left out of the prompt."""
+
+    def __init__(self, selector: ToolSelector, shown: tuple):
+        self.selector = selector
+        self.shown = set(shown)
+
+    def on_agent_action(self, action, **kwargs):
+        if action.tool not in self.shown:
+            self.selector.record_escalation()
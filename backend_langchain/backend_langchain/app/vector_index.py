@@ -0,0 +1,92 @@
+"""
+In-process vector search over a memory-mapped snapshot of the `aws_docs`
+Chroma collection (written by app.export_index).
+
+Snapshot layout in INDEX_SNAPSHOT_DIR:
+    vectors-<version>.npy   float32 [count, dim], rows L2-normalised
+    meta-<version>.json     ids, documents, metadatas in row order
+    CURRENT                 the live <version>, replaced atomically
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+
+def read_current_version(snapshot_dir: str) -> str | None:
+    try:
+        with open(os.path.join(snapshot_dir, "CURRENT"), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+class SnapshotIndex:
+    """Exact top-k cosine search over the snapshot, reloaded when CURRENT changes."""
+
+    def __init__(self, snapshot_dir: str, refresh_seconds: float):
+        self.snapshot_dir = snapshot_dir
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self.version = None
+        self._vectors = None
+        self._meta = None
+
+    def _maybe_refresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.refresh_seconds:
+            return
+        with self._lock:
+            if now - self._checked_at < self.refresh_seconds:
+                return
+            self._checked_at = now
+            version = read_current_version(self.snapshot_dir)
+            if version is None or version == self.version:
+                return
+            try:
+                vectors = np.load(os.path.join(self.snapshot_dir, f"vectors-{version}.npy"), mmap_mode="r")
+                with open(os.path.join(self.snapshot_dir, f"meta-{version}.json"), encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load index snapshot {version}: {e}")
+                return
+            self._vectors, self._meta, self.version = vectors, meta, version
+            logger.info(f"Loaded index snapshot {version} ({vectors.shape[0]} vectors)")
+
+    def available(self) -> bool:
+        self._maybe_refresh()
+        return self._vectors is not None and len(self._vectors) > 0
+
+    def search(self, query_vec, k: int = 4) -> list[Document] | None:
+        """Top-k documents for the query vector, or None when no snapshot is loaded."""
+        if not self.available():
+            return None
+        vectors, meta = self._vectors, self._meta
+
+        q = np.array(query_vec, dtype=np.float32)
+        q /= np.linalg.norm(q) or 1.0
+        scores = vectors @ q
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            Document(
+                page_content=meta["documents"][i],
+                metadata={**(meta["metadatas"][i] or {}), "id": meta["ids"][i], "score": float(scores[i])},
+            )
+            for i in top
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "vectors": 0 if self._vectors is None else int(self._vectors.shape[0]),
+        }